@@ -0,0 +1,254 @@
+# src/model/analysis/internal_forces.py
+
+import numpy as np
+from src.model.model import Model
+from src.model.loads.fixed_end_forces import UniformlyDistributedLoad, SelfWeight, PointLoad
+
+# Last axis of the internal force arrays, same order as the local end forces
+INTERNAL_FORCES = ["Nx", "Vy", "Vz", "Tx", "My", "Mz"]
+
+def element_stations(model:Model, stations):
+    """
+    Distances from node i of every element, (n_elements, n_stations).\n
+    stations: number of equally spaced stations, or relative positions
+    (0 = node i, 1 = node j)
+    """
+    if np.ndim(stations) == 0:
+        stations = np.linspace(0.0, 1.0, int(stations))
+    L = np.array([element.length() for element in model.element.values()])
+    return L[:, None] * np.asarray(stations, dtype=float)[None, :]
+
+def stacked_end_forces(model:Model):
+    """
+    Local end forces of the last solve, (n_elements, 12) stacked layout.
+    """
+    end_forces = model.element_end_forces_local
+    if end_forces is None or len(end_forces) != len(model.element):
+        raise RuntimeError(
+            "Model.linear_static_solve() was not called for the current model"
+        )
+    return end_forces.reshape(-1, 12)
+
+def load_terms(model:Model, x):
+    """
+    Sum of the element load contributions (ElementLoad.axial, shear_y, ...)
+    at the stations x (n_elements, n_stations) for the currently applied
+    loads, (n_elements, n_stations, 6) ordered like INTERNAL_FORCES.\n
+    Uniform loads and point loads are evaluated for all elements at once,
+    other load types through their own methods.
+    Load components are resolved to local axes by the solve (fef_local).
+    """
+    n_elements = x.shape[0]
+    w = np.zeros((n_elements, 3))   # summed uniform loads, local x, y, z
+    point_rows, point_a, point_p = [], [], []
+    terms = np.zeros((*x.shape, 6))
+
+    for e, element in enumerate(model.element.values()):
+        for load in element.loads:
+            if isinstance(load, (UniformlyDistributedLoad, SelfWeight)):
+                w[e] += (load.wx, load.wy, load.wz)
+            elif isinstance(load, PointLoad):
+                point_rows.append(e)
+                point_a.append(load.a)
+                point_p.append((load.px, load.py, load.pz))
+            else:
+                xe = x[e]
+                terms[e] += np.stack([
+                    load.axial(xe, element),    load.shear_y(xe, element),
+                    load.shear_z(xe, element),  load.torsion(xe, element),
+                    load.moment_y(xe, element), load.moment_z(xe, element)
+                ], axis=-1)
+
+    # Uniform loads
+    terms[..., 0] += w[:, 0, None] * x
+    terms[..., 1] += w[:, 1, None] * x
+    terms[..., 2] += w[:, 2, None] * x
+    terms[..., 4] += 0.5 * w[:, 2, None] * x**2
+    terms[..., 5] += 0.5 * w[:, 1, None] * x**2
+
+    # Point loads, acting for x > a
+    if point_rows:
+        rows = np.array(point_rows)
+        p = np.array(point_p)
+        arm = x[rows] - np.array(point_a)[:, None]     # (n_loads, n_stations)
+        acting = arm > 0.0
+        arm = np.where(acting, arm, 0.0)
+
+        point_terms = np.stack([
+            p[:, 0, None] * acting, p[:, 1, None] * acting,
+            p[:, 2, None] * acting, np.zeros(arm.shape),
+            p[:, 2, None] * arm,    p[:, 1, None] * arm
+        ], axis=-1)
+        np.add.at(terms, rows, point_terms)
+
+    return terms
+
+def combine_internal_forces(end_forces, terms, x):
+    """
+    Internal forces from local end forces (..., n_elements, 12), load terms
+    (..., n_elements, n_stations, 6) and stations x (n_elements, n_stations).
+    Same sign conventions as Element.Nx_internal, ..., Mz_internal.
+    """
+    f = end_forces[..., None, :]    # broadcast over the stations
+    return np.stack([
+        -(f[..., 0] + terms[..., 0]),                       # Nx
+        f[..., 1] + terms[..., 1],                          # Vy
+        f[..., 2] + terms[..., 2],                          # Vz
+        -(f[..., 3] + terms[..., 3]),                       # Tx
+        f[..., 4] + f[..., 2] * x + terms[..., 4],          # My
+        -(f[..., 5] - f[..., 1] * x - terms[..., 5])        # Mz
+    ], axis=-1)
+
+def internal_forces(model:Model, stations):
+    """
+    Internal forces of every element for the last solved load combination,
+    (n_elements, n_stations, 6) ordered like INTERNAL_FORCES.
+    Element rows follow model.element_index, DOFs an element does
+    not have (Beam: Nx, Tx) and trusses are 0.0
+    """
+    x = element_stations(model, stations)
+    return combine_internal_forces(stacked_end_forces(model), load_terms(model, x), x)
+
+def force_envelope(model:Model, load_combos, stations=11, superposition=False):
+    """
+    Streams the load combinations into an Envelope of the internal forces.\n
+    The end forces of all combinations come from one solve_all call
+    (superposition: see solve_all), the element load terms are evaluated
+    once per load case at unit factor and combined with the load factors.
+    """
+    from src.model.loads.load_combo import LoadCombination
+    from src.model.results.envelope import Envelope
+    from src.model.analysis.linear_static import (
+        solve_all, load_case_factors, assemble_loads, assemble_fixed_end_forces
+    )
+
+    x = element_stations(model, stations)
+    envelope = Envelope(model.element_index, x)
+    load_combos = list(load_combos)
+    results = solve_all(model, load_combos, superposition)
+    end_forces = results.end_forces_local.reshape(len(load_combos), -1, 12)
+
+    # Load terms per load case, the solve resolves the loads to local axes
+    load_cases, factors = load_case_factors(load_combos)
+    case_terms = np.zeros((len(load_cases), *x.shape, 6))
+    for l, load_case in enumerate(load_cases):
+        model.apply_loads_in_load_combo(LoadCombination(load_case.name, {load_case: 1.0}))
+        assemble_loads(model)
+        assemble_fixed_end_forces(model)
+        case_terms[l] = load_terms(model, x)
+
+    for c, load_combo in enumerate(load_combos):
+        terms = np.tensordot(factors[c], case_terms, axes=1)
+        envelope.add(load_combo.name, combine_internal_forces(end_forces[c], terms, x))
+    return envelope
+
+def internal_force_extrema(model:Model):
+    """
+    Exact max/min of every internal force along every element for the
+    last solved load combination.\n
+    Between the breakpoints (member ends and point load positions) the
+    internal forces are polynomials of degree <= 2:
+        F(x) = c0 + c1 x + c2 x^2
+    so the extrema are at the segment ends (both one-sided limits at a
+    point load) or at the root of the derivative (zero shear for moments).
+    All elements are evaluated at once.\n
+    Returns (max, x_max, min, x_min), each (n_elements, 6) ordered like
+    INTERNAL_FORCES, x = distance from node i. Elements carrying other
+    load types are sampled at 101 stations instead.
+    """
+    elements = list(model.element.values())
+    n_elements = len(elements)
+    L = np.array([element.length() for element in elements])
+    f = stacked_end_forces(model)
+
+    w = np.zeros((n_elements, 3))   # summed uniform loads, local x, y, z
+    point_rows, point_a, point_p = [], [], []
+    sampled = []                    # elements with other load types
+    for e, element in enumerate(elements):
+        for load in element.loads:
+            if isinstance(load, (UniformlyDistributedLoad, SelfWeight)):
+                w[e] += (load.wx, load.wy, load.wz)
+            elif isinstance(load, PointLoad):
+                point_rows.append(e)
+                point_a.append(load.a)
+                point_p.append((load.px, load.py, load.pz))
+            else:
+                sampled.append(e)
+
+    # Point loads sorted along every element, padded to K per element
+    rows = np.array(point_rows, dtype=int)
+    a = np.array(point_a, dtype=float)
+    p = np.array(point_p, dtype=float).reshape(-1, 3)
+    order = np.lexsort((a, rows))
+    rows, a, p = rows[order], a[order], p[order]
+    count = np.bincount(rows, minlength=n_elements)
+    K = int(count.max(initial=0))
+    rank = np.arange(len(rows)) - np.repeat(np.cumsum(count) - count, count)
+
+    A = np.repeat(L[:, None], K, axis=1)    # padding acts beyond node j
+    P = np.zeros((n_elements, K, 3))
+    A[rows, rank] = a
+    P[rows, rank] = p
+
+    # Segments [B_k, B_k+1], the first k point loads act on segment k
+    B = np.hstack([np.zeros((n_elements, 1)), np.clip(A, 0.0, L[:, None]), L[:, None]])
+    P_sum = np.concatenate([np.zeros((n_elements, 1, 3)), np.cumsum(P, axis=1)], axis=1)
+    PA_sum = np.concatenate(
+        [np.zeros((n_elements, 1, 3)), np.cumsum(P * A[..., None], axis=1)], axis=1
+    )
+
+    # Coefficients (n_elements, K + 1, 6) of c0 + c1 x + c2 x^2
+    ones = np.ones(K + 1)
+    c0 = np.stack([
+        -(f[:, 0, None] + P_sum[..., 0]),               # Nx
+        f[:, 1, None] + P_sum[..., 1],                  # Vy
+        f[:, 2, None] + P_sum[..., 2],                  # Vz
+        -f[:, 3, None] * ones,                          # Tx
+        f[:, 4, None] - PA_sum[..., 2],                 # My
+        -f[:, 5, None] - PA_sum[..., 1]                 # Mz
+    ], axis=-1)
+    c1 = np.stack([
+        -w[:, 0, None] * ones,
+        w[:, 1, None] * ones,
+        w[:, 2, None] * ones,
+        np.zeros((n_elements, K + 1)),
+        f[:, 2, None] + P_sum[..., 2],
+        f[:, 1, None] + P_sum[..., 1]
+    ], axis=-1)
+    c2 = np.zeros(c0.shape)
+    c2[..., 4] = 0.5 * w[:, 2, None]
+    c2[..., 5] = 0.5 * w[:, 1, None]
+
+    # Candidates: both segment ends and the stationary point
+    left = np.broadcast_to(B[:, :-1, None], c0.shape)
+    right = np.broadcast_to(B[:, 1:, None], c0.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vertex = np.where(c2 != 0.0, -c1 / (2.0 * c2), left)
+    vertex = np.clip(vertex, left, right)
+
+    x = np.stack([left, right, vertex], axis=2)     # (n, K + 1, 3, 6)
+    values = c0[:, :, None] + c1[:, :, None] * x + c2[:, :, None] * x**2
+    segment = (B[:, 1:] > B[:, :-1])[:, :, None, None]  # skip zero-length segments
+
+    x = x.reshape(n_elements, -1, 6)
+    high = np.where(segment, values, -np.inf).reshape(n_elements, -1, 6)
+    low = np.where(segment, values, np.inf).reshape(n_elements, -1, 6)
+    i_max = np.argmax(high, axis=1)[:, None]
+    i_min = np.argmin(low, axis=1)[:, None]
+
+    F_max = np.take_along_axis(high, i_max, axis=1)[:, 0]
+    x_max = np.take_along_axis(x, i_max, axis=1)[:, 0]
+    F_min = np.take_along_axis(low, i_min, axis=1)[:, 0]
+    x_min = np.take_along_axis(x, i_min, axis=1)[:, 0]
+
+    if sampled:
+        sampled = np.unique(sampled)
+        xs = element_stations(model, 101)
+        forces = combine_internal_forces(f, load_terms(model, xs), xs)[sampled]
+        s_max, s_min = np.argmax(forces, axis=1), np.argmin(forces, axis=1)
+        F_max[sampled] = np.take_along_axis(forces, s_max[:, None], axis=1)[:, 0]
+        F_min[sampled] = np.take_along_axis(forces, s_min[:, None], axis=1)[:, 0]
+        x_max[sampled] = np.take_along_axis(xs[sampled], s_max, axis=1)
+        x_min[sampled] = np.take_along_axis(xs[sampled], s_min, axis=1)
+
+    return F_max, x_max, F_min, x_min
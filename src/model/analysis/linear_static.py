@@ -2,7 +2,10 @@
 
 import numpy as np 
 from src.utils.exceptions import DOFError
+from src.utils.helpers import stacked_dof_positions
 from src.model.model import Model
+from src.model.loads.load_combo import LoadCombination
+from src.model.results.result_set import ResultSet
 
 def assemble_loads(model:Model):
     model.F_full = np.zeros(model.ndof)
@@ -31,79 +34,287 @@ def assemble_loads(model:Model):
                 )
 
 def assemble_fixed_end_forces(model:Model):
-    for element in model.element.values():
-        if element.fef_local is None: # skip if truss
+    """
+    Adds the fixed-end forces of the applied element loads to F_full and
+    keeps the local FEFs of every element in model.element_fef
+    (n_elements, 12), stacked layout (zero for trusses).
+    """
+    elements = list(model.element.values())
+    model.element_fef = np.zeros((len(elements), 12))
+    for element_type, (rows, dofs, valid) in model.element_dofs.items():
+        group = [elements[row] for row in rows]
+        if group[0].fef_local is None: # skip if truss
             continue
 
-        element.compute_fef()
-        
-        T = element.transformation_matrix()
-        fef_global = T.T @ element.fef_local
+        for element in group:
+            element.compute_fef()
 
-        dofs = element.get_dof_indices()
-        for i, global_dof in enumerate(dofs):
-            if global_dof is not None:
-                # subtract because FEFs are reactions
-                model.F_full[global_dof] -= fef_global[i]
+        T, _ = model.element_matrices[element_type]
+        fef_local = np.array([element.fef_local for element in group])
+        model.element_fef[rows[:, None], stacked_dof_positions(element_type)] = fef_local
+        fef_global = np.einsum("nji,nj->ni", T, fef_local)  # T^T @ fef_local
+
+        # subtract because FEFs are reactions
+        np.subtract.at(model.F_full, dofs[valid], fef_global[valid])
 
 def solve_matrix_equation(model:Model):
     free = model.free_dofs
-    K_ff = model.K_full[np.ix_(free, free)]
     F_f  = model.F_full[free]
-    D_f = np.linalg.solve(K_ff, F_f)
+    D_f = model.K_ff_factor.solve(F_f) # reuses factorization from preprocess()
 
     model.D_full = np.zeros(model.ndof)
     model.D_full[free] = D_f
     model.reactions = model.K_full @ model.D_full - model.F_full
 
 def store_displacements(model:Model):
-    for node in model.node.values():
-        for local_dof, global_dof in node.dofs.items():
-            if global_dof in model.free_dofs:
-                node.displacements[local_dof] = model.D_full[global_dof]
-            else:
-                node.displacements[local_dof] = 0.0
+    """
+    Gathers D_full into per-node arrays (model.nodal_displacements),
+    node dictionaries are filled on access.
+    """
+    has_dof = model.node_dofs >= 0
+    model.nodal_displacements = np.zeros(model.node_dofs.shape)
+    model.nodal_displacements[has_dof] = model.D_full[model.node_dofs[has_dof]]
 
 def store_reactions(model:Model):
-    for node in model.node.values():
-        for local_dof, global_dof in node.dofs.items():
-            if global_dof in model.restrained_dofs:
-                node.reactions[local_dof] = model.reactions[global_dof]
+    """
+    Gathers the reactions at restrained DOFs into per-node arrays
+    (model.nodal_reactions) and hands both result arrays to the NodeTable.
+    """
+    has_dof = model.node_dofs >= 0
+    restrained = np.zeros(model.node_dofs.shape, dtype=bool)
+    restrained[has_dof] = model.restrained_mask[model.node_dofs[has_dof]]
 
-def compute_end_forces(model:Model):
-    for element in model.element.values():
-        if element.fef_local is None: # skip if truss
+    model.nodal_reactions = np.zeros(model.node_dofs.shape)
+    model.nodal_reactions[restrained] = model.reactions[model.node_dofs[restrained]]
+    model.node_table.store_results(model.nodal_displacements, model.nodal_reactions)
+
+def batch_end_forces(model:Model, D, fef):
+    """
+    Element end forces of every element for any number of displacement
+    vectors, computed per element type with the cached T and k_local stacks.\n
+    D: (ncombos, ndof) model-level displacements\n
+    fef: (ncombos, n_elements, 12) local fixed-end forces, stacked layout\n
+    Returns (end_forces_local, end_forces_global), each
+    (ncombos, n_elements, 2, 6), see ResultSet. Trusses are skipped.
+    """
+    ncombos = len(D)
+    n_elements = len(model.element_table)
+    end_forces_local = np.zeros((ncombos, n_elements, 12))
+    end_forces_global = np.zeros((ncombos, n_elements, 12))
+
+    elements = list(model.element.values())
+    for element_type, (rows, dofs, valid) in model.element_dofs.items():
+        if elements[rows[0]].fef_local is None: # skip if truss
             continue
-        
-        dofs = element.get_dof_indices()
 
-        # Extract global displacements for element
-        d_global = np.zeros(len(dofs))
-        for i, dof in enumerate(dofs):
-            if dof is not None:     # dof is none for restrained DOFs
-                d_global[i] = model.D_full[dof]
+        T, k_local = model.element_matrices[element_type]
+        pos = stacked_dof_positions(element_type)
+
+        d_global = np.where(valid, D[:, dofs], 0.0)                 # (c, n, nd)
+        d_local = np.einsum("nij,cnj->cni", T, d_global)
+        f_local = np.einsum("nij,cnj->cni", k_local, d_local) + fef[:, rows][:, :, pos]
 
-        # Transformation to local displacements
-        T = element.transformation_matrix()
-        d_local = T @ d_global
+        end_forces_local[:, rows[:, None], pos] = f_local
+        end_forces_global[:, rows[:, None], pos] = np.einsum("nji,cnj->cni", T, f_local)
 
-        # Local end forces
-        if element.fef_local is None: # if truss
-            f_local = element.local_stiffness() @ d_local
-        else:
-            f_local = element.local_stiffness() @ d_local + element.fef_local
+    return (
+        end_forces_local.reshape(ncombos, n_elements, 2, 6),
+        end_forces_global.reshape(ncombos, n_elements, 2, 6)
+    )
 
-        element.end_forces_local[:] = f_local
-        element.end_forces_global[:] = T.T @ f_local
+def compute_end_forces(model:Model):
+    """
+    End forces of every element from D_full and the FEFs of the last
+    assemble_fixed_end_forces, one batch for the whole model.\n
+    The per-element arrays are filled per element type (trusses skipped).
+    """
+    elements = list(model.element.values())
+    end_forces_local, end_forces_global = batch_end_forces(
+        model, model.D_full[None], model.element_fef[None]
+    )
+    model.element_end_forces_local = end_forces_local[0]
+    model.element_end_forces_global = end_forces_global[0]
+
+    stacked_local = end_forces_local[0].reshape(len(elements), 12)
+    stacked_global = end_forces_global[0].reshape(len(elements), 12)
+    for element_type, (rows, _, _) in model.element_dofs.items():
+        group = [elements[row] for row in rows]
+        if group[0].fef_local is None: # skip if truss
+            continue
+        pos = stacked_dof_positions(element_type)
+        local = stacked_local[rows[:, None], pos]
+        global_ = stacked_global[rows[:, None], pos]
+        for element, f_local, f_global in zip(group, local, global_):
+            element.end_forces_local[:] = f_local
+            element.end_forces_global[:] = f_global
 
 def solve(model:Model):
     if not model._preprocessed:
         raise RuntimeError(
             "Model.preprocess() was not called before solve()"
         )
+    if model.pending_updates:
+        model.update_elements()
     assemble_loads(model)
     assemble_fixed_end_forces(model)
     solve_matrix_equation(model)
     store_displacements(model)
     store_reactions(model)
-    compute_end_forces(model)
\ No newline at end of file
+    compute_end_forces(model)
+
+def last_results(model:Model, combo_name):
+    """
+    ResultSet of the last solve (one combination) from the per-node and
+    per-element arrays, which every solve allocates anew.
+    """
+    return ResultSet(
+        combo_names = [combo_name],
+        node_index = model.node_index,
+        element_index = model.element_index,
+        displacements = model.nodal_displacements[None],
+        reactions = model.nodal_reactions[None],
+        end_forces_local = model.element_end_forces_local[None],
+        end_forces_global = model.element_end_forces_global[None]
+    )
+
+def load_case_factors(load_combos):
+    """
+    Distinct load cases of the combinations (first-seen order) and the
+    (ncombos x ncases) matrix of their factors.
+    """
+    load_cases = list(dict.fromkeys(
+        load_case for load_combo in load_combos for load_case in load_combo.loadCaseAndFactors
+    ))
+    factors = np.array([
+        [load_combo.loadCaseAndFactors.get(lc, 0.0) for lc in load_cases]
+        for load_combo in load_combos
+    ]).reshape(len(load_combos), len(load_cases))
+    return load_cases, factors
+
+def solve_stacked(model:Model, load_combos):
+    """
+    Solves the load combinations as one multi-RHS system.\n
+    Load vectors and fixed-end forces are assembled once per load case at
+    unit factor, the combinations are formed as F_all = F_cases @ factors^T
+    and solved with a single call to the cached factorization.
+    Returns (displacements, reactions, end_forces_local, end_forces_global)
+    stacked per combination, see ResultSet for the array layout.
+    """
+    ncombos = len(load_combos)
+    load_cases, factors = load_case_factors(load_combos)
+
+    # Load matrix and local FEFs, one column/entry per load case
+    F_cases = np.zeros((model.ndof, len(load_cases)))
+    fef_cases = np.zeros((len(load_cases), len(model.element_index), 12))
+    for l, load_case in enumerate(load_cases):
+        model.apply_loads_in_load_combo(LoadCombination(load_case.name, {load_case: 1.0}))
+        assemble_loads(model)
+        assemble_fixed_end_forces(model)
+        F_cases[:, l] = model.F_full
+        fef_cases[l] = model.element_fef
+
+    F_all = F_cases @ factors.T
+    fef_all = np.einsum("cl,l...->c...", factors, fef_cases)
+
+    # Solve all right-hand sides together
+    free = model.free_dofs
+    D_all = np.zeros((model.ndof, ncombos))
+    D_all[free] = model.K_ff_factor.solve(F_all[free])
+    R_all = model.K_full @ D_all - F_all
+    R_all[free] = 0.0   # reactions only exist at restrained DOFs
+
+    # Nodal results, (ncombos, n_nodes, 6)
+    has_dof = model.node_dofs >= 0
+    displacements = np.zeros((ncombos, *model.node_dofs.shape))
+    reactions = np.zeros((ncombos, *model.node_dofs.shape))
+    displacements[:, has_dof] = D_all[model.node_dofs[has_dof]].T
+    reactions[:, has_dof] = R_all[model.node_dofs[has_dof]].T
+
+    # Element end forces, (ncombos, n_elements, 2, 6)
+    end_forces_local, end_forces_global = batch_end_forces(model, D_all.T, fef_all)
+
+    return displacements, reactions, end_forces_local, end_forces_global
+
+def superpose_load_cases(model:Model, load_combos):
+    """
+    Builds combination results as factor-weighted sums of load case results.\n
+    Every LoadCase is solved once at unit factor and cached on the model
+    (model.load_case_results) together with its version, later combinations
+    reuse the cached arrays until loads are added to the case.
+    The cache is cleared by preprocess() and whenever the model changes.
+    """
+    load_cases, factors = load_case_factors(load_combos)
+
+    if not load_cases:
+        # no combinations, or combinations without load cases: zero results
+        n_nodes, n_elements = len(model.node_index), len(model.element_index)
+        return tuple(
+            np.zeros((len(load_combos), *shape))
+            for shape in ((n_nodes, 6), (n_nodes, 6), (n_elements, 2, 6), (n_elements, 2, 6))
+        )
+
+    cached = model.load_case_results
+    unsolved = [
+        lc for lc in load_cases
+        if lc not in cached or cached[lc][0] != lc._version
+    ]
+    if unsolved:
+        unit_combos = [LoadCombination(lc.name, {lc: 1.0}) for lc in unsolved]
+        case_results = solve_stacked(model, unit_combos)
+        for k, load_case in enumerate(unsolved):
+            cached[load_case] = (load_case._version, tuple(r[k] for r in case_results))
+
+    return tuple(
+        np.einsum(
+            "cl,l...->c...", factors,
+            np.stack([cached[lc][1][i] for lc in load_cases])
+        )
+        for i in range(4)
+    )
+
+def solve_all(model:Model, load_combos, superposition=False):
+    """
+    Solves all load combinations at once.\n
+    superposition=False: the load vectors of the combinations are formed
+    from load case vectors assembled once and solved as the columns of one
+    multi-RHS system.\n
+    superposition=True: every load case is solved once and combinations
+    are formed as factor-weighted sums of the load case results.\n
+    Displacements, reactions and end forces are returned as stacked arrays
+    (ResultSet), node dictionaries and element end force vectors are not written.
+    """
+    if not model._preprocessed:
+        raise RuntimeError(
+            "Model.preprocess() was not called before solve_all()"
+        )
+    if model.pending_updates:
+        model.update_elements()
+
+    if superposition:
+        results = superpose_load_cases(model, load_combos)
+    else:
+        results = solve_stacked(model, load_combos)
+    displacements, reactions, end_forces_local, end_forces_global = results
+
+    return ResultSet(
+        combo_names = [load_combo.name for load_combo in load_combos],
+        node_index = model.node_index,
+        element_index = model.element_index,
+        displacements = displacements,
+        reactions = reactions,
+        end_forces_local = end_forces_local,
+        end_forces_global = end_forces_global
+    )
+
+def solve_to_store(model:Model, load_combos, store, superposition=False):
+    """
+    Solves the load combinations in batches of store.chunk_size with
+    solve_all and appends every batch to the ResultStore, so only one
+    batch of results is held in memory.
+    """
+    load_combos = list(load_combos)
+    for start in range(0, len(load_combos), store.chunk_size):
+        batch = load_combos[start:start + store.chunk_size]
+        store.append(solve_all(model, batch, superposition))
+    store.flush()
+    return store
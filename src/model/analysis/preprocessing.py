@@ -2,127 +2,496 @@
 
 from src.model.model import Model
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee, connected_components
+from scipy.sparse.linalg import splu
+from scipy.linalg import LinAlgError
+from src.model.analysis.solvers import (
+    BandedCholesky, ConjugateGradient, LowRankUpdate,
+    bandwidth_and_profile, factor_pivots, smallest_eigenpairs
+)
 from src.utils.exceptions import ModelDefinitionError, StabilityError, ElementError
+from src.utils.helpers import DOF_NAMES
 
 
+def check_element_properties(elements):
+    """
+    Checks the material (E, G) and section (area, Ixx, Iyy, J) values of
+    the elements, once per distinct material/section: E and area must be
+    positive, the other values non-negative, all finite.
+    """
+    for attr, kind, values in (
+        ("material", "material", ("E", "G")),
+        ("section", "section", ("area", "Ixx", "Iyy", "J"))
+    ):
+        checked = {}
+        for element in elements:
+            obj = getattr(element, attr)
+            if obj is None:
+                raise ModelDefinitionError(f"Element {element.id} has no {kind} assigned.")
+            if id(obj) in checked:
+                continue
+            checked[id(obj)] = obj
+            props = np.array([getattr(obj, value) for value in values], dtype=float)
+            invalid = ~np.isfinite(props) | (props < 0.0)
+            invalid[0] |= props[0] <= 0.0
+            if np.any(invalid):
+                raise ElementError(
+                    f"Element {element.id}: invalid {values[np.argmax(invalid)]} "
+                    f"of {kind} {obj.id}."
+                )
+
 def validate_model(model:Model):
+    """
+    Topology and property checks in one pass over nodes and elements.\n
+    Element ends are looked up in an identity map of the model's nodes
+    (O(1) per end), lengths, material and section values are checked as
+    arrays. The connected components of the node graph are stored in
+    model.topology_report and screened for rigid body motion: a component
+    without any restraint is unstable before any matrix is assembled.
+    Nodes without elements are reported, they get no DOFs.
+    """
     # check if nodes, elements exist 
     if not model.node:
         raise ModelDefinitionError("Model has no nodes.")
 
     if not model.element:
         raise ModelDefinitionError("Model has no elements.")      
-    
+
+    nodes = list(model.node.values())
+    elements = list(model.element.values())
+    node_rows = {id(node): row for row, node in enumerate(nodes)}
+
     # check element connectivity
-    for element in model.element.values():
-        if element.i not in model.node.values():
-            raise ElementError(f"Element {element.id} has invalid start node.")
-        if element.j not in model.node.values():
-            raise ElementError(f"Element {element.id} has invalid end node.")
-        if element.i is element.j:
-            raise ElementError(f"Element {element.id} has zero connectivity (i == j).")
-
-    # check element properties
-    for element in model.element.values():
-        if hasattr(element, "E") and element.E <= 0:
-            raise ElementError(f"Element {element.id}: invalid E.")
-        if hasattr(element, "A") and element.A <= 0:
-            raise ElementError(f"Element {element.id}: invalid A.")
+    i = np.array([node_rows.get(id(element.i), -1) for element in elements])
+    j = np.array([node_rows.get(id(element.j), -1) for element in elements])
+    for ends, name in ((i, "start"), (j, "end")):
+        if np.any(ends < 0):
+            element = elements[np.argmax(ends < 0)]
+            raise ElementError(f"Element {element.id} has invalid {name} node.")
+    if np.any(i == j):
+        raise ElementError(f"Element {elements[np.argmax(i == j)].id} has zero connectivity (i == j).")
 
-def assign_dofs(model:Model):
-    model.free_dofs = []
-    model.restrained_dofs = []
+    xyz = np.concatenate([np.zeros(0)] + [node._xyz for node in nodes]).reshape(-1, 3)
+    zero_length = np.linalg.norm(xyz[j] - xyz[i], axis=1) <= 0.0
+    if np.any(zero_length):
+        raise ElementError(f"Element {elements[np.argmax(zero_length)].id} has zero length.")
 
-    dof_counter = 0
-    for node in model.node.values():
-        node.dofs = {}
+    check_element_properties(elements)
+
+    # connected components of the node graph, orphan nodes are their own
+    n = len(nodes)
+    graph = sp.coo_matrix((np.ones(len(i)), (i, j)), shape=(n, n))
+    n_components, component = connected_components(graph, directed=False)
+
+    connected = np.zeros(n, dtype=bool)
+    connected[i] = connected[j] = True
+    orphans = np.flatnonzero(~connected)
+    if len(orphans) > 0:
+        print(
+            f"Warning: {len(orphans)} node(s) without elements, e.g. "
+            f"{', '.join(str(nodes[row].id) for row in orphans[:5].tolist())}"
+        )
+
+    restrained = np.array([any(node.restraints.values()) for node in nodes])
+    supported = np.zeros(n_components, dtype=bool)
+    supported[component[restrained]] = True
+    supported[component[orphans]] = True    # orphans have no DOFs
+    model.topology_report = {
+        "components": n_components - len(orphans),
+        "component": component,         # label per node row
+        "orphan_nodes": [nodes[row].id for row in orphans.tolist()],
+    }
+    if not np.all(supported):
+        free = np.flatnonzero(~supported)
+        msg = "Unrestrained substructure (rigid body motion):\n"
+        for label in free[:5].tolist():
+            members = np.flatnonzero(component == label)
+            msg += (
+                f"  {len(members)} node(s) without any restraint, e.g. "
+                f"{', '.join(str(nodes[row].id) for row in members[:5].tolist())}\n"
+            )
+        raise StabilityError(msg)
+
+def node_numbering_order(model:Model):
+    """
+    Returns the NodeTable rows in the order their DOFs are numbered.\n
+    reorder=None: node insertion order\n
+    reorder="rcm": Reverse Cuthill-McKee ordering of the node adjacency
+    graph built from the element connectivity (reduces bandwidth/profile)
+    """
+    n = len(model.node_table)
+    if model.reorder is None:
+        return np.arange(n)
+    
+    if model.reorder != "rcm":
+        raise ValueError(f"Invalid DOF reordering: {model.reorder}")
+
+    i, j = model.element_table.i, model.element_table.j
+    graph = sp.coo_matrix(
+        (np.ones(2*len(i)), (np.concatenate([i, j]), np.concatenate([j, i]))),
+        shape=(n, n)
+    ).tocsr()
+
+    return reverse_cuthill_mckee(graph, symmetric_mode=True)
+
+def assign_dofs(model:Model):
+    nodes = model.node_table
+    elements = model.element_table
 
     # DOF declaration 
     # Elements dictate what DOFs are available for the node
-    for element in model.element.values():
-        for node in (element.i, element.j):
-            for dof in element.NODE_DOF_INDICES:
-                if dof not in node.dofs:
-                    node.dofs[dof] = None   # make local dof key with None value
-                    node.restraints.setdefault(dof, False)
+    has_dof = np.zeros((len(nodes), 6), dtype=bool)
+    for element_type, rows in elements.rows_by_type().items():
+        for ends in (elements.i[rows], elements.j[rows]):
+            has_dof[np.ix_(ends, element_type.NODE_DOF_INDICES)] = True
     
+    # Node/element rows used by the stacked (array) results
+    model.node_index = nodes.index
+    model.element_index = elements.index
+
     # Numbering Phase
-    for node in model.node.values():                   
-        for dof_name in sorted(node.dofs.keys()):
-            # Assign model-level DOF value to key dof_name
-            node.dofs[dof_name] = dof_counter   
-
-            # DOF is either restrained or free
-            if node.restraints.get(dof_name, False):
-                model.restrained_dofs.append(dof_counter)
-            else:
-                model.free_dofs.append(dof_counter)
-            
-            dof_counter += 1
-    model.ndof = dof_counter
+    # DOFs are counted node by node in numbering order, ascending DOF name
+    order = node_numbering_order(model)
+    numbered = has_dof[order]
+    counter = np.cumsum(numbered.ravel()).reshape(numbered.shape) - 1
+    model.node_dofs = np.full((len(nodes), 6), -1, dtype=int) # -1 = no DOF
+    model.node_dofs[order] = np.where(numbered, counter, -1)
+    model.ndof = int(numbered.sum())
+
+    # DOF is either restrained or free
+    restrained = np.zeros(model.ndof, dtype=bool)
+    restrained[model.node_dofs[has_dof]] = nodes.restrained()[has_dof]
+    model.restrained_mask = restrained
+    model.free_mask = ~restrained
+    model.free_dofs = np.flatnonzero(model.free_mask)
+    model.restrained_dofs = np.flatnonzero(restrained)
+    model.free_position = np.full(model.ndof, -1)
+    model.free_position[model.free_dofs] = np.arange(len(model.free_dofs))
+
+    # Model-level DOF index on the node objects
+    for node in model.node.values():
+        row = nodes.index[node.id]
+        node.dofs = {}
+        for dof_name in np.flatnonzero(has_dof[row]).tolist():
+            node.dofs[dof_name] = int(model.node_dofs[row, dof_name])
+            node.restraints.setdefault(dof_name, False)
+
+def build_connectivity(model:Model):
+    """
+    Element DOF index arrays used by every gather/scatter step.\n
+    model.element_dofs[element type] = (rows, dofs, valid)
+        rows: ElementTable rows of the elements of that type
+        dofs: (n, nd) model-level DOFs in local DOF order
+        valid: (n, nd) False where a node has no such DOF (dofs = -1)
+    """
+    table = model.element_table
+    model.element_dofs = {}
+    for element_type, rows in table.rows_by_type().items():
+        local = element_type.NODE_DOF_INDICES
+        dofs = np.hstack([
+            model.node_dofs[table.i[rows]][:, local],
+            model.node_dofs[table.j[rows]][:, local]
+        ])
+        model.element_dofs[element_type] = (rows, dofs, dofs >= 0)
 
 def assemble_stiffness(model:Model):
-    model.K_full = np.zeros((model.ndof, model.ndof))
+    """
+    Assembles the global stiffness matrix in sparse format.\n
+    Element matrices are computed per element type by the batch kernels
+    from the ElementTable arrays and collected as COO triplets
+    (row, col, value), duplicate entries are summed on conversion to CSC.
+    The transformation and (condensed) local stiffness stacks are cached
+    in model.element_matrices.
+    """
+    rows, cols, vals = [], [], []
+    model.element_matrices = {}
+    all_elements = list(model.element.values())
 
-    for element in model.element.values():
-        K = element.global_stiffness()
-        dofs = element.get_dof_indices() # available DOFs from the element 
-        nd = len(dofs)
-        
-        for i in range(nd):     # i and j are the global stiffness indices (row, col)
-            for j in range(nd):
-                if dofs[i] is not None and dofs[j] is not None:
-                    model.K_full[dofs[i], dofs[j]] += K[i, j]
+    for element_type, (elements, dofs, valid) in model.element_dofs.items():
+        props = model.element_table.properties(elements, model.node_table)
+        T, k_local = element_type.batch_element_matrices(
+            props, [all_elements[row] for row in elements]
+        )
+        K = T.transpose(0, 2, 1) @ k_local @ T  # (n, nd, nd)
+
+        # Kept for the batched FEF and end force post-processing
+        model.element_matrices[element_type] = (T, k_local)
+        nd = dofs.shape[1]
+
+        # i and j are the global stiffness indices (row, col)
+        i = np.repeat(dofs, nd, axis=1).ravel()
+        j = np.tile(dofs, nd).ravel()
+        entries = (np.repeat(valid, nd, axis=1) & np.tile(valid, nd)).ravel()
+
+        rows.append(i[entries])
+        cols.append(j[entries])
+        vals.append(K.ravel()[entries])
+
+    model.K_full = sp.coo_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(model.ndof, model.ndof)
+    ).tocsc()
+
+def extract_free_stiffness(model:Model):
+    free = model.free_dofs
+    model.K_ff = model.K_full[free, :][:, free].tocsc()
+
+def report_bandwidth(model:Model):
+    """
+    Stores the half-bandwidth and profile of K_ff in model.bandwidth_report,
+    for the node insertion numbering ("natural") and, if a reordering
+    was requested, for the renumbered DOFs.
+    """
+    model.bandwidth_report = {}
+    if model.reorder is not None:
+        model.bandwidth_report[model.reorder] = bandwidth_and_profile(model.K_ff)
+
+    # Free DOFs listed in node insertion order, as positions in K_ff
+    has_dof = model.node_dofs >= 0
+    dofs = model.node_dofs[has_dof]                 # row-major = natural numbering
+    natural = model.free_position[dofs[model.free_mask[dofs]]]
+    model.bandwidth_report["natural"] = bandwidth_and_profile(
+        model.K_ff[natural, :][:, natural]
+    )
+
+def factorize_stiffness(model:Model):
+    """
+    Factorizes K_ff once so that every load combination
+    only needs forward/back substitution.\n
+    solver="sparse": SuperLU in symmetric mode (minimum degree ordering
+    on A^T + A, no off-diagonal pivoting), K_ff is symmetric positive definite\n
+    solver="banded": banded Cholesky on the current DOF numbering,
+    use together with reorder="rcm"\n
+    solver="cg": no factorization, preconditioned conjugate gradient
+    (model.cg_options) for models too large to factorize
+    """
+    model.K_ff_factor = None
+    # iterative solver log, only filled by CG solves
+    model.cg_iterations = []
+    model.cg_residuals = []
+    if model.solver == "sparse":
+        try:
+            model.K_ff_factor = splu(
+                model.K_ff,
+                permc_spec="MMD_AT_PLUS_A",
+                diag_pivot_thresh=0.0,
+                options={"SymmetricMode": True}
+            )
+        except RuntimeError: # exactly singular, reported by check_stability
+            pass
+    elif model.solver == "banded":
+        try:
+            model.K_ff_factor = BandedCholesky(model.K_ff)
+        except LinAlgError: # not positive definite, reported by check_stability
+            pass
+    elif model.solver == "cg":
+        # Positions in K_ff of the free DOFs of every node (block-Jacobi)
+        node_pos = np.where(
+            model.node_dofs >= 0, model.free_position[model.node_dofs], -1
+        )
+        blocks = [row[row >= 0] for row in node_pos]
+        blocks = [block for block in blocks if len(block) > 0]
+
+        model.K_ff_factor = ConjugateGradient(
+            model.K_ff, blocks=blocks, **model.cg_options
+        )
+        model.cg_iterations = model.K_ff_factor.iterations
+        model.cg_residuals = model.K_ff_factor.residuals
+    else:
+        raise ValueError(f"Invalid solver: {model.solver}")
+
+def dof_labels(model:Model, dofs):
+    """
+    Returns "Node <id>, DOF <name>" for every model-level DOF in dofs.
+    """
+    rows, names = np.nonzero(model.node_dofs >= 0)
+    owner_row = np.empty(model.ndof, dtype=int)
+    owner_dof = np.empty(model.ndof, dtype=int)
+    owner_row[model.node_dofs[rows, names]] = rows
+    owner_dof[model.node_dofs[rows, names]] = names
+
+    node_ids = list(model.node_index)
+    return [
+        f"Node {node_ids[owner_row[dof]]}, DOF {DOF_NAMES[owner_dof[dof]]}"
+        for dof in dofs
+    ]
+
+# Mechanism threshold for the pivots of K_ff relative to their diagonal and
+# for the eigenvalues of the diagonally scaled D^-1/2 K_ff D^-1/2. Mechanisms
+# leave values at roundoff level (1e-16 to 1e-14 on the frames, trusses and
+# released members tested), stable frames stay above 1/cond of the scaled
+# matrix: 1e-2 to 1e-9 for realistic models, 5e-13 for a chain of 1000
+# rod-like frame members.
+MECHANISM_TOL = 1e-13
 
 def check_stability(model:Model):
+    """
+    Stability screen, cheapest checks first:\n
+    1. zero rows of K_ff (DOFs without any stiffness)\n
+    2. near-zero pivots of the factorization that is reused for solving
+    (sparse and banded solvers, see MECHANISM_TOL)\n
+    3. stability_check="eigen": the few smallest eigenvalues of the scaled
+    K_ff from a sparse shift-invert eigen solve (one extra factorization),
+    also used to describe the mechanism modes whenever 2. fails.\n
+    The CG solver has no factorization: "pivots" only runs 1. and warns,
+    stability_check="eigen" is needed to screen CG models for mechanisms.
+    """
     tol=1e-8
+
     # Extract free–free stiffness matrix
     free = model.free_dofs
     if len(free) == 0:
         raise StabilityError("No free DOFs in model.")
 
-    K_ff = model.K_full[np.ix_(free, free)]
-
-    dof_map = {}
-    for node in model.node.values():
-        for dof_name, gidx in node.dofs.items():
-            if gidx in free:
-                dof_map[gidx] = (node.id, dof_name)
+    K_ff = model.K_ff
+    diag = K_ff.diagonal()
 
     # Zero row/column check
-    zero_rows = []
-    for i in range(K_ff.shape[0]):
-        if np.all(np.abs(K_ff[i, :]) < tol):
-            zero_rows.append(free[i])
-
-    if zero_rows:
-        for dof in zero_rows:
-            node_id, dof_name = dof_map[dof]
-            msg += f"  Node {node_id}, DOF {dof_name}\n"
-        raise StabilityError("Zero stiffness detected at DOFs:\n")
+    row_max = abs(K_ff).max(axis=1).toarray().ravel()
+    zero_rows = free[row_max < tol]
+
+    if len(zero_rows) > 0:
+        msg = "Zero stiffness detected at DOFs:\n"
+        for label in dof_labels(model, zero_rows):
+            msg += f"  {label}\n"
+        raise StabilityError(msg)
+    
+    if model.stability_check is None:
+        return
     
-    #eigvals, eigvecs = np.linalg.eigh(K_ff)
-    eigvals = np.linalg.eigvalsh(K_ff)
-    unstable_modes = np.where(eigvals < tol)[0]
+    # Pivot check, CG has no factor pivots
+    singular = False
+    small_pivots = []
+    if model.solver != "cg":
+        pivots = factor_pivots(model.K_ff_factor)
+        if pivots is None:
+            singular = True
+        else:
+            small_pivots = free[pivots <= MECHANISM_TOL * np.abs(diag)]
+    elif model.stability_check == "pivots":
+        print(
+            "Warning: solver 'cg' has no factorization, only zero stiffness was "
+            "checked. Use stability_check='eigen' to screen for mechanisms."
+        )
 
-    if len(unstable_modes) > 0:
-        msg = "Unstable structural modes detected.\n"
+    # Mechanism modes, eigenpairs of the diagonally scaled K_ff
+    mechanisms = []
+    if singular or len(small_pivots) > 0 or model.stability_check == "eigen":
+        scale = 1.0 / np.sqrt(np.abs(diag))
+        eigvals, eigvecs = smallest_eigenpairs(
+            sp.diags(scale) @ K_ff @ sp.diags(scale)
+        )
+        for mode in np.flatnonzero(eigvals < MECHANISM_TOL).tolist():
+            vec = scale * eigvecs[:, mode]
+            mechanisms.append(vec / np.linalg.norm(vec))
 
-        # for mode in unstable_modes:
-        #     msg += f"Mode {mode + 1}:\n"
-        #     vec = eigvecs[:, mode]
+    if singular or len(small_pivots) > 0 or mechanisms:
+        msg = "Unstable structural modes detected.\n"
+        if len(small_pivots) > 0:
+            msg += "Near-zero pivots at:\n"
+            for label in dof_labels(model, small_pivots):
+                msg += f"  {label}\n"
 
-        #     for local_i, amp in enumerate(vec):
-        #         if abs(amp) > 1e-3:
-        #             global_dof = free[local_i]
-        #             node_id, dof_name = dof_map[global_dof]
-        #             msg += f"  Node {node_id} -> {DOF_NAMES[dof_name]} (amplitude {amp:.3f})\n"
+        for mode, vec in enumerate(mechanisms):
+            msg += f"Mode {mode + 1}:\n"
+            moving = np.flatnonzero(np.abs(vec) > 1e-3)
+            for local_i, label in zip(moving, dof_labels(model, free[moving])):
+                msg += f"  {label} (amplitude {vec[local_i]:.3f})\n"
         
         raise StabilityError(msg)
 
 def preprocess(model:Model):
     validate_model(model)
+    # always rebuilt, restraint dictionaries may have been written directly
+    model.node_table = None
+    model.build_tables()
     assign_dofs(model)
+    build_connectivity(model)
     assemble_stiffness(model)
+    extract_free_stiffness(model)
+    report_bandwidth(model)
+    factorize_stiffness(model)
     check_stability(model)
-    model._preprocessed = True
\ No newline at end of file
+    model.load_case_results = {}
+    model.pending_updates = set()
+    model._preprocessed = True
+
+def update_elements(model:Model, element_ids, max_rank=200):
+    """
+    Applies material/section changes of already assembled elements without
+    reassembling or refactorizing.\n
+    The element stiffness deltas are added to K_full/K_ff and, for the direct
+    solvers, to a Sherman-Morrison-Woodbury update of the existing factor
+    (LowRankUpdate). Once the accumulated rank exceeds max_rank, or the
+    update makes K_ff (nearly) singular, K_ff is refactorized and checked
+    like in preprocess(). CG iterates on the updated K_ff with a rebuilt
+    preconditioner. The new materials and sections are checked like in
+    validate_model().
+    """
+    check_element_properties([model.element[element_id] for element_id in element_ids])
+    table = model.element_table
+    rows = np.array([table.index[element_id] for element_id in element_ids], dtype=int)
+
+    dof_rows, dof_cols, vals = [], [], []
+    for element_type, (type_rows, dofs, valid) in model.element_dofs.items():
+        changed = np.flatnonzero(np.isin(type_rows, rows))
+        if len(changed) == 0:
+            continue
+
+        T_old, k_old = model.element_matrices[element_type]
+        T, k_local = element_type.batch_element_matrices(
+            table.properties(type_rows[changed], model.node_table),
+            [model.element[table.ids[row]] for row in type_rows[changed]]
+        )
+        delta = (
+            T.transpose(0, 2, 1) @ k_local @ T
+            - T_old[changed].transpose(0, 2, 1) @ k_old[changed] @ T_old[changed]
+        )
+        T_old[changed] = T
+        k_old[changed] = k_local
+
+        nd = dofs.shape[1]
+        i = np.repeat(dofs[changed], nd, axis=1).ravel()
+        j = np.tile(dofs[changed], nd).ravel()
+        entries = (np.repeat(valid[changed], nd, axis=1) & np.tile(valid[changed], nd)).ravel()
+        dof_rows.append(i[entries])
+        dof_cols.append(j[entries])
+        vals.append(delta.ravel()[entries])
+
+    model.load_case_results = {}
+    model.pending_updates -= set(element_ids)
+    if not vals:
+        return
+    dof_rows, dof_cols, vals = map(np.concatenate, (dof_rows, dof_cols, vals))
+
+    model.K_full = model.K_full + sp.coo_matrix(
+        (vals, (dof_rows, dof_cols)), shape=model.K_full.shape
+    ).tocsc()
+
+    # Update restricted to K_ff, dense on the touched free DOFs
+    free = model.free_mask[dof_rows] & model.free_mask[dof_cols]
+    i = model.free_position[dof_rows[free]]
+    j = model.free_position[dof_cols[free]]
+    model.K_ff = model.K_ff + sp.coo_matrix(
+        (vals[free], (i, j)), shape=model.K_ff.shape
+    ).tocsc()
+
+    if model.solver == "cg":
+        model.K_ff_factor.set_matrix(model.K_ff)
+        return
+
+    positions, local = np.unique(np.concatenate([i, j]), return_inverse=True)
+    delta = np.zeros((len(positions), len(positions)))
+    np.add.at(delta, (local[:len(i)], local[len(i):]), vals[free])
+
+    if not isinstance(model.K_ff_factor, LowRankUpdate):
+        model.K_ff_factor = LowRankUpdate(model.K_ff_factor, model.K_ff.shape[0])
+
+    if len(np.union1d(model.K_ff_factor.positions, positions)) <= max_rank:
+        model.K_ff_factor.add(positions, delta)
+        if model.K_ff_factor.condition() < 1e12:
+            return
+
+    factorize_stiffness(model)
+    check_stability(model)
\ No newline at end of file
@@ -0,0 +1,279 @@
+# src/model/analysis/solvers.py
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import cholesky_banded, cho_solve_banded, lu_factor, lu_solve
+from scipy.sparse.linalg import SuperLU, eigsh, spilu, spsolve_triangular, ArpackNoConvergence
+from src.utils.exceptions import SolverError
+
+def bandwidth_and_profile(K):
+    """
+    Returns the half-bandwidth and the skyline profile of a symmetric
+    sparse matrix.\n
+    Both are measured on the lower triangle: for every row i, the
+    height is i minus the column of its first nonzero entry.
+    """
+    K = K.tocoo()
+    lower = K.row >= K.col
+
+    first = np.arange(K.shape[0])   # first nonzero column per row
+    np.minimum.at(first, K.row[lower], K.col[lower])
+    heights = np.arange(K.shape[0]) - first
+
+    return int(heights.max(initial=0)), int(heights.sum())
+
+class BandedCholesky:
+    """
+    Cholesky factorization of a symmetric positive definite matrix in
+    LAPACK upper banded storage.\n
+    Memory and work only depend on the half-bandwidth, so this is meant
+    to be used after bandwidth-reducing DOF renumbering.
+    Provides solve(b) like scipy's SuperLU object.
+    """
+    def __init__(self, K):
+        K = K.tocoo()
+        self.bandwidth, _ = bandwidth_and_profile(K)
+
+        upper = K.row <= K.col
+        ab = np.zeros((self.bandwidth + 1, K.shape[0]))
+        # ab[u + i - j, j] = K[i, j] for i <= j
+        np.add.at(
+            ab,
+            (self.bandwidth + K.row[upper] - K.col[upper], K.col[upper]),
+            K.data[upper]
+        )
+        self.cb = cholesky_banded(ab, lower=False)
+
+    def solve(self, b):
+        return cho_solve_banded((self.cb, False), b)
+
+    def pivots(self):
+        # K = U^T U, pivot i is U[i, i]^2
+        return self.cb[-1]**2
+
+class LowRankUpdate:
+    """
+    Solver for K + E D E^T that reuses the factorization of K
+    (Sherman-Morrison-Woodbury). Provides solve(b) like scipy's SuperLU object.\n
+    E selects the rows self.positions of K, D (rank x rank) is the
+    accumulated symmetric update of those rows and columns. D may be
+    singular (element stiffness changes usually are):
+        (K + E D E^T)^-1 b = y - Z D (I + E^T Z D)^-1 E^T y,
+        y = K^-1 b, Z = K^-1 E
+    """
+    def __init__(self, factor, n):
+        self.factor = factor
+        self.positions = np.zeros(0, dtype=int)
+        self.D = np.zeros((0, 0))
+        self.Z = np.zeros((n, 0))   # K^-1 E, one column per position
+        self.M = None
+
+    @property
+    def rank(self):
+        return len(self.positions)
+
+    def add(self, positions, delta):
+        """
+        Adds the symmetric update delta of the rows/columns positions.
+        Only positions not updated before need new solves with K.
+        """
+        new = np.setdiff1d(positions, self.positions)
+        if len(new) > 0:
+            E = np.zeros((self.Z.shape[0], len(new)))
+            E[new, np.arange(len(new))] = 1.0
+            self.Z = np.hstack([self.Z, self.factor.solve(E).reshape(E.shape)])
+            self.positions = np.concatenate([self.positions, new])
+            self.D = np.pad(self.D, (0, len(new)))
+
+        order = np.argsort(self.positions)
+        local = order[np.searchsorted(self.positions, positions, sorter=order)]
+        self.D[np.ix_(local, local)] += delta
+
+        self.M = np.eye(self.rank) + self.Z[self.positions] @ self.D
+        self.M_lu = lu_factor(self.M, check_finite=False)
+
+    def condition(self):
+        # condition number of I + E^T Z D, large if K + E D E^T is (nearly) singular
+        return np.linalg.cond(self.M)
+
+    def solve(self, b):
+        y = self.factor.solve(b)
+        return y - self.Z @ (self.D @ lu_solve(self.M_lu, y[self.positions]))
+
+def factor_pivots(factor):
+    """
+    Returns the pivots of a K_ff factorization, ordered like the rows of
+    K_ff, or None if the solver does not factorize K_ff (CG).
+    """
+    if isinstance(factor, SuperLU):
+        # Pr K Pc = L U, pivot U[j, j] belongs to row k of K with perm_c[k] = j
+        return factor.U.diagonal()[factor.perm_c]
+    if isinstance(factor, BandedCholesky):
+        return factor.pivots()
+    return None
+
+def smallest_eigenpairs(K, k=6, maxiter=300):
+    """
+    The k smallest eigenvalues (ascending) and eigenvectors of the
+    symmetric positive semi-definite matrix K.\n
+    Large matrices use a sparse shift-invert Lanczos solve around a small
+    negative shift, so K itself may be singular. At most maxiter Lanczos
+    restarts are run, only the converged pairs are returned then.
+    """
+    n = K.shape[0]
+    k = min(k, n)
+    if n <= 200:
+        vals, vecs = np.linalg.eigh(K.toarray())
+        return vals[:k], vecs[:, :k]
+    
+    shift = 1e-6 * np.abs(K.diagonal()).mean()
+    try:
+        vals, vecs = eigsh(K.tocsc(), k=k, sigma=-shift, which="LM", maxiter=maxiter)
+    except ArpackNoConvergence as error:
+        vals, vecs = error.eigenvalues, error.eigenvectors
+    order = np.argsort(vals)
+    return vals[order], vecs[:, order]
+
+class ConjugateGradient:
+    """
+    Preconditioned conjugate gradient solver for K_ff (symmetric positive
+    definite). Provides solve(b) like scipy's SuperLU object.\n
+    preconditioner:
+        "jacobi": inverse of the diagonal
+        "block_jacobi": inverse of the per-node diagonal blocks (blocks)
+        "ichol": incomplete Cholesky L D L^T (see incomplete_cholesky)\n
+    Every solve is warm-started from the previous solution. The iteration
+    count and relative residual history of every right-hand side are
+    appended to self.iterations and self.residuals.
+    """
+    def __init__(self, K, preconditioner="jacobi", tol=1e-10, maxiter=None, blocks=None):
+        self.preconditioner = preconditioner
+        self.blocks = blocks
+        self.tol = tol
+        self.maxiter = 10 * K.shape[0] if maxiter is None else maxiter
+
+        self.x0 = np.zeros(K.shape[0])
+        self.iterations = []
+        self.residuals = []
+        self.set_matrix(K)
+
+    def set_matrix(self, K):
+        """
+        Replaces K (same size, e.g. after a stiffness update) and rebuilds
+        the preconditioner. The warm start and the log are kept.
+        """
+        self.K = K.tocsr()
+        if self.preconditioner == "jacobi":
+            M = sp.diags(1.0 / self.K.diagonal())
+            self.precondition = M.__matmul__
+        elif self.preconditioner == "block_jacobi":
+            M = block_jacobi_inverse(self.K, self.blocks)
+            self.precondition = M.__matmul__
+        elif self.preconditioner == "ichol":
+            self.precondition = incomplete_cholesky(self.K)
+        else:
+            raise ValueError(f"Invalid preconditioner: {self.preconditioner}")
+
+    def solve(self, b):
+        if b.ndim == 1:
+            return self._pcg(b)
+        
+        # Several right-hand sides, each one warm-starts from the previous
+        x = np.zeros(b.shape)
+        for c in range(b.shape[1]):
+            x[:, c] = self._pcg(b[:, c])
+        return x
+
+    def _pcg(self, b):
+        b_norm = np.linalg.norm(b)
+        if b_norm == 0.0:
+            self.iterations.append(0)
+            self.residuals.append([0.0])
+            return np.zeros(b.shape)
+
+        x = self.x0.copy()
+        r = b - self.K @ x
+        residuals = [np.linalg.norm(r) / b_norm]
+
+        z = self.precondition(r)
+        p = z.copy()
+        rz = r @ z
+        while residuals[-1] > self.tol:
+            if len(residuals) > self.maxiter:
+                raise SolverError(
+                    f"CG did not converge in {self.maxiter} iterations "
+                    f"(relative residual {residuals[-1]:.3e})"
+                )
+            Kp = self.K @ p
+            alpha = rz / (p @ Kp)
+            x += alpha * p
+            r -= alpha * Kp
+            residuals.append(np.linalg.norm(r) / b_norm)
+
+            z = self.precondition(r)
+            rz_new = r @ z
+            p = z + (rz_new / rz) * p
+            rz = rz_new
+
+        self.x0 = x
+        self.iterations.append(len(residuals) - 1)
+        self.residuals.append(residuals)
+        return x.copy()
+
+def block_jacobi_inverse(K, blocks):
+    """
+    Block diagonal inverse of K, one block per node.\n
+    blocks: list of index arrays (positions in K of the DOFs of one node).
+    Blocks of equal size are inverted together.
+    """
+    K = K.tocsr()
+    rows, cols, vals = [], [], []
+    for size in {len(block) for block in blocks}:
+        idx = np.array([block for block in blocks if len(block) == size])
+        r = np.repeat(idx, size, axis=1).reshape(-1, size, size)
+        c = np.tile(idx, size).reshape(-1, size, size)
+
+        K_blocks = np.asarray(K[r.ravel(), c.ravel()]).reshape(-1, size, size)
+        rows.append(r.ravel())
+        cols.append(c.ravel())
+        vals.append(np.linalg.inv(K_blocks).ravel())
+
+    return sp.coo_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=K.shape
+    ).tocsr()
+
+def incomplete_cholesky(K, drop_tol=1e-4, fill_factor=10):
+    """
+    Returns a function applying (L D L^T)^-1, an incomplete Cholesky
+    preconditioner of the symmetric positive definite matrix K.\n
+    L and D are taken from SuperLU's threshold incomplete LU in symmetric
+    mode (same row and column ordering, no off-diagonal pivoting).
+    Only L is kept so that the preconditioner stays symmetric, as CG requires.
+    """
+    ilu = spilu(
+        K.tocsc(),
+        drop_tol=drop_tol,
+        fill_factor=fill_factor,
+        permc_spec="MMD_AT_PLUS_A",
+        diag_pivot_thresh=0.0,
+        options={"SymmetricMode": True}
+    )
+    L = ilu.L.tocsr()
+    LT = L.T.tocsr()
+    D = ilu.U.diagonal()
+    if np.any(D <= 0.0):
+        raise SolverError(
+            "Incomplete Cholesky factor is not positive definite, "
+            "use the jacobi or block_jacobi preconditioner."
+        )
+
+    # Pr K Pc = L D L^T
+    def precondition(r):
+        y = np.empty(r.shape)
+        y[ilu.perm_r] = r
+        y = spsolve_triangular(L, y, lower=True, unit_diagonal=True)
+        y = spsolve_triangular(LT, y / D, lower=False, unit_diagonal=True)
+        return y[ilu.perm_c]
+    
+    return precondition
@@ -22,25 +22,27 @@ class Beam(Frame):
         self.end_forces_local  = np.zeros(8)
         self.end_forces_global = np.zeros(8)
 
-    def transformation_matrix(self): #8x8
-        R = self.rotation_matrix()
-        T = np.zeros((8, 8))
+    # --------------------------------
+    # BATCH KERNELS
+    # --------------------------------
+    @classmethod
+    def batch_transformation(cls, R): #8x8
+        T = np.zeros((len(R), 8, 8))
 
         # Node i
-        T[0:2, 0:2] = R[1:3, 1:3]   # uy, uz
-        T[2:4, 2:4] = R[1:3, 1:3]   # ry, rz
+        T[:, 0:2, 0:2] = R[:, 1:3, 1:3]   # uy, uz
+        T[:, 2:4, 2:4] = R[:, 1:3, 1:3]   # ry, rz
 
         # Node j
-        T[4:6, 4:6] = R[1:3, 1:3]
-        T[6:8, 6:8] = R[1:3, 1:3]
+        T[:, 4:6, 4:6] = R[:, 1:3, 1:3]
+        T[:, 6:8, 6:8] = R[:, 1:3, 1:3]
 
         return T
 
-    def local_stiffness(self):
-        k = super().local_stiffness()
+    @classmethod
+    def batch_local_stiffness(cls, props):
+        k = super().batch_local_stiffness(props)
 
         # Remove axial and torsion DOFs
-        remove = [0, 3, 6, 9]  # ux_i, rx_i, ux_j, rx_j
-        k = np.delete(k, remove, axis=0)
-        k = np.delete(k, remove, axis=1)
-        return k
+        keep = [1, 2, 4, 5, 7, 8, 10, 11]  # uy, uz, ry, rz at node i and j
+        return k[:, keep][:, :, keep]
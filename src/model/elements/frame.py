@@ -1,8 +1,74 @@
 # src/model/elements/frame.py
 
-from src.model.geometry.base_element import Element
+from src.model.geometry.base_element import Element, element_properties
 import numpy as np
 
+def local_stiffness_batch(E, G, A, Iy, Iz, J, L):
+    """
+    Local stiffness matrices of n frame elements, (n, 12, 12).\n
+    All inputs are arrays of length n.
+    Iy: weak axis (bending about local y), Iz: strong axis (bending about local z)
+    """
+    k = np.zeros((len(L), 12, 12))
+
+    def put(i, j, value):
+        k[:, i, j] = k[:, j, i] = value
+
+    # axial
+    put(0, 0,  E*A / L);    put(6, 6, E*A / L)
+    put(0, 6, -E*A / L)
+
+    # torsion
+    put(3, 3,  G*J / L);    put(9, 9, G*J / L)
+    put(3, 9, -G*J / L)
+
+    # bending about local z
+    put(1, 1,  12*E*Iz / L**3);  put(7, 7, 12*E*Iz / L**3)
+    put(1, 7, -12*E*Iz / L**3)
+
+    put(1, 5,   6*E*Iz / L**2);  put(1, 11,  6*E*Iz / L**2)
+    put(5, 7,  -6*E*Iz / L**2);  put(7, 11, -6*E*Iz / L**2)
+
+    put(5, 5,   4*E*Iz / L);     put(11, 11, 4*E*Iz / L)
+    put(5, 11,  2*E*Iz / L)
+
+    # bending about local y
+    put(2, 2,  12*E*Iy / L**3);  put(8, 8, 12*E*Iy / L**3)
+    put(2, 8, -12*E*Iy / L**3)
+
+    put(2, 4,  -6*E*Iy / L**2);  put(2, 10, -6*E*Iy / L**2)
+    put(4, 8,   6*E*Iy / L**2);  put(8, 10,  6*E*Iy / L**2)
+
+    put(4, 4,   4*E*Iy / L);     put(10, 10, 4*E*Iy / L)
+    put(4, 10,  2*E*Iy / L)
+
+    return k
+
+def condense(k_local, released):
+    """
+    Static condensation of n local stiffness matrices sharing the same
+    released positions, (n, nd, nd).\n
+    Returns (k_condensed, P), each (n, nd, nd), released rows and columns
+    are zero. P condenses fixed-end forces: fef_condensed = P @ fef, i.e.
+    f_kept - k_kr k_rr^-1 f_released.
+    """
+    nd = k_local.shape[1]
+    released = np.asarray(released)
+    kept = np.setdiff1d(np.arange(nd), released)
+
+    k_kk = k_local[:, kept[:, None], kept]
+    k_kr = k_local[:, kept[:, None], released]
+    k_rr = k_local[:, released[:, None], released]
+    X = np.linalg.solve(k_rr, k_kr.transpose(0, 2, 1))  # k_rr^-1 k_rk
+
+    k_condensed = np.zeros(k_local.shape)
+    k_condensed[:, kept[:, None], kept] = k_kk - k_kr @ X
+
+    P = np.zeros(k_local.shape)
+    P[:, kept, kept] = 1.0
+    P[:, kept[:, None], released] = -X.transpose(0, 2, 1)  # k_kr k_rr^-1
+    return k_condensed, P
+
 class Frame(Element):
     NODE_DOF_INDICES = [0, 1, 2, 3, 4, 5]
     LOCAL_DOFS_PER_NODE = ["ux", "uy", "uz", "rx", "ry", "rz"]
@@ -28,60 +94,93 @@ class Frame(Element):
         self.end_forces_global = np.zeros(12)
 
     def transformation_matrix(self): #12x12
-        R = self.rotation_matrix()
-        T = np.zeros((12, 12))
-
-        for i in range(4):
-            T[i*3:(i+1)*3, i*3:(i+1)*3] = R
-
-        return T
+        return self._cached_geometry(
+            "T", lambda: self.batch_transformation(self.rotation_matrix()[None])[0]
+        )
     
     def local_stiffness(self):
-        E = self.material.E
-        G = self.material.G
-        A = self.section.area
-        J = self.section.J
-        L = self.length()
-
-        Iy = self.section.Iyy # weak axis is bending about y
-        Iz = self.section.Ixx # strong axis is bending about z
-
-        k = np.zeros((12, 12))
+        return self.batch_local_stiffness(element_properties([self]))[0]
 
-        # axial
-        k[0, 0] = k[6, 6] =  E*A / L
-        k[0, 6] = k[6, 0] = -E*A / L
-
-        # torsion
-        k[3, 3] = k[9, 9] =  G*J / L
-        k[3, 9] = k[9, 3] = -G*J / L
-
-        # bending about local z
-        k[1, 1]  = k[7, 7]  =  12*E*Iz / L**3
-        k[1, 7]  = k[7, 1]  = -12*E*Iz / L**3
-
-        k[1, 5]  = k[5, 1]  =  6*E*Iz / L**2
-        k[1,11]  = k[11,1]  =  6*E*Iz / L**2
-        k[5, 7]  = k[7, 5]  = -6*E*Iz / L**2        
-        k[7, 11] = k[11, 7] = -6*E*Iz / L**2        
+    # --------------------------------
+    # BATCH KERNELS
+    # --------------------------------
+    @classmethod
+    def batch_transformation(cls, R):
+        """
+        Transformation matrices from rotation matrices R (n, 3, 3), (n, 12, 12).
+        """
+        T = np.zeros((len(R), 12, 12))
+        for i in range(4):
+            T[:, i*3:(i+1)*3, i*3:(i+1)*3] = R
+        return T
 
-        k[5, 5]  = k[11,11] =  4*E*Iz / L
-        k[5,11]  = k[11,5]  =  2*E*Iz / L
+    @classmethod
+    def batch_local_stiffness(cls, props):
+        return local_stiffness_batch(
+            props["E"], props["G"], props["A"], 
+            props["Iy"], props["Iz"], props["J"], props["L"]
+        )
 
-        # bending about local y
-        k[2, 2]  = k[8, 8]  =  12*E*Iy / L**3
-        k[2, 8]  = k[8, 2]  = -12*E*Iy / L**3
+    @classmethod
+    def released_positions(cls, mask):
+        """
+        Positions in the local stiffness matrix of the DOFs released in mask.
+        """
+        dofs = [node*6 + dof for node in (0, 1) for dof in cls.NODE_DOF_INDICES]
+        return [p for p, dof in enumerate(dofs) if mask >> dof & 1]
 
-        k[2, 4]  = k[4, 2]  = -6*E*Iy / L**2
-        k[2,10]  = k[10,2]  = -6*E*Iy / L**2
-        k[4, 8]  = k[8, 4]  =  6*E*Iy / L**2
-        k[8,10]  = k[10,8]  =  6*E*Iy / L**2
+    # props compared to find elements with identical condensation
+    CONDENSATION_KEY = ["releases", "E", "G", "A", "Iy", "Iz", "J", "L"]
 
-        k[4, 4]  = k[10,10] =  4*E*Iy / L
-        k[4,10]  = k[10,4]  =  2*E*Iy / L
+    @classmethod
+    def batch_condensation(cls, props, k_local):
+        """
+        Condenses the released DOFs out of the local stiffness matrices k_local.\n
+        Returns (k_condensed (n, nd, nd), released rows, P (n_released, nd, nd)),
+        P are the FEF condensation operators of the released rows (see condense).
+        Elements sharing a release pattern are condensed together, once per
+        distinct (release pattern, material, section, length).
+        """
+        k_local = k_local.copy()
+        rows = np.flatnonzero(props["releases"])
+        if len(rows) == 0:
+            return k_local, rows, np.zeros((0, *k_local.shape[1:]))
+
+        keys = np.column_stack([props[name][rows] for name in cls.CONDENSATION_KEY])
+        unique, first, inverse = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True
+        )
+        k_condensed = np.empty((len(unique), *k_local.shape[1:]))
+        P = np.empty((len(unique), *k_local.shape[1:]))
+        for mask in np.unique(unique[:, 0]).tolist():
+            group = np.flatnonzero(unique[:, 0] == mask)
+            k_condensed[group], P[group] = condense(
+                k_local[rows[first[group]]], cls.released_positions(int(mask))
+            )
+
+        inverse = inverse.ravel()
+        k_local[rows] = k_condensed[inverse]
+        return k_local, rows, P[inverse]
+
+    @classmethod
+    def batch_element_matrices(cls, props, elements=None):
+        T = cls.batch_transformation(props["R"])
+        k_local, rows, P = cls.batch_condensation(props, cls.batch_local_stiffness(props))
+        if elements is not None:
+            for row, k, p in zip(rows.tolist(), k_local[rows], P):
+                elements[row]._cached_geometry("condensation", lambda k=k, p=p: (k, p))
+        return T, k_local
+
+    # the condensation is kept in the geometry cache (dropped when the
+    # element moves), release/material/section changes drop it as well
+    def _modified(self):
+        self._geometry_cache.pop("condensation", None)
+        super()._modified()
+
+    def _properties_modified(self):
+        self._geometry_cache.pop("condensation", None)
+        super()._properties_modified()
 
-        return k 
-            
     def release(self, node:str, dof):
         """
         Release a DOF at a node.\n
@@ -97,30 +196,31 @@ class Frame(Element):
             raise ValueError(f"Invalid node: select 'i' or 'j'")
         
         self.releases[node].add(dof)
+        self._modified()
 
-    def apply_releases(self, k_local):
-        released = set(self.releases["i"]) | set(self.releases["j"])
-        if not released:
-            return k_local
+    def released_mask(self) -> int:
+        mask = 0
+        for dof in self.releases["i"] | self.releases["j"]:
+            mask |= 1 << dof
+        return mask
 
-        kept = [i for i in range(12) if i not in released]
+    def condensation(self):
+        """
+        Returns the (k_condensed, P) of this element, see condense. Filled
+        by the model assembly, kept until the element moves or its releases,
+        material or section change.
+        """
+        return self._cached_geometry("condensation", self._compute_condensation)
 
-        k_kk = k_local[np.ix_(kept, kept)]
-        k_kr = k_local[np.ix_(kept, list(released))]
-        k_rk = k_local[np.ix_(list(released), kept)]
-        k_rr = k_local[np.ix_(list(released), list(released))]
+    def _compute_condensation(self):
+        props = element_properties([self])
+        k_local, _, P = self.batch_condensation(props, self.batch_local_stiffness(props))
+        return k_local[0], P[0]
 
-        if k_rr.size == 0:
+    def apply_releases(self, k_local):
+        if not self.released_mask():
             return k_local
-
-        k_cond = k_kk - k_kr @ np.linalg.inv(k_rr) @ k_rk
-
-        k_full = np.zeros((12, 12))
-        for a, i in enumerate(kept):
-            for b, j in enumerate(kept):
-                k_full[i, j] = k_cond[a, b]
-
-        return k_full
+        return self.condensation()[0]
 
     def global_stiffness(self):
         T = self.transformation_matrix()
@@ -139,11 +239,6 @@ class Frame(Element):
         for load in self.loads:
             self.fef_local += load.fef_local(self)
 
-        # Remove fefs on release dofs
-        NODE_i = 0
-        NODE_j = 1
-        for dof in self.releases["i"]:
-            self.fef_local[self.dofs_to_vector_index[NODE_i, dof]] = 0.0
-        for dof in self.releases["j"]:
-            self.fef_local[self.dofs_to_vector_index[NODE_j, dof]] = 0.0
-        
\ No newline at end of file
+        # Condense fefs of released dofs onto the kept dofs
+        if self.released_mask():
+            self.fef_local[:] = self.condensation()[1] @ self.fef_local
@@ -1,6 +1,6 @@
 # src/model/elements/truss.py
 
-from src.model.geometry.base_element import Element
+from src.model.geometry.base_element import Element, element_properties
 import numpy as np
 
 class Truss(Element):
@@ -22,25 +22,34 @@ class Truss(Element):
         self.end_forces_global = np.zeros(6)
 
     def transformation_matrix(self):
-        x, _, _ = self.local_axes()
-        l, m, n = x
-
-        return np.array([
-            [ l, m, n, 0, 0, 0],
-            [ 0, 0, 0, l, m, n]
-        ])
+        return self._cached_geometry(
+            "T", lambda: self.batch_transformation(self.rotation_matrix()[None])[0]
+        )
 
     def local_stiffness(self):
-        E = self.material.E
-        A = self.section.area
-        L = self.length()
-        k = E * A / L
-
-        return np.array([[ k, -k],
-                         [-k,  k]])
+        return self.batch_local_stiffness(element_properties([self]))[0]
     
     def global_stiffness(self):
         T = self.transformation_matrix()
         k_local = self.local_stiffness()
         return T.T @ k_local @ T
-     
\ No newline at end of file
+
+    # --------------------------------
+    # BATCH KERNELS
+    # --------------------------------
+    @classmethod
+    def batch_transformation(cls, R):
+        """
+        Transformation matrices from rotation matrices R (n, 3, 3), (n, 2, 6).
+        """
+        T = np.zeros((len(R), 2, 6))
+        T[:, 0, 0:3] = R[:, 0]  # local x axis: l, m, n
+        T[:, 1, 3:6] = R[:, 0]
+        return T
+
+    @classmethod
+    def batch_local_stiffness(cls, props):
+        k = props["E"] * props["A"] / props["L"]
+
+        return k[:, None, None] * np.array([[ 1.0, -1.0],
+                                            [-1.0,  1.0]])
@@ -11,6 +11,107 @@ ux, uy, uz = 0, 1, 2
 rx, ry, rz = 3, 4, 5
 NODE_i, NODE_j = 0, 1
 
+def local_axes_batch(d, roll):
+    """
+    Vectorized local axes of n elements.\n
+    d: (n, 3) node j - node i coordinate differences\n
+    roll: (n,) roll angles in radians\n
+    Returns x_local, y_local, z_local, each (n, 3)
+    """
+    L = np.sqrt(np.sum(d*d, axis=1))
+    cos_phi = np.cos(roll)
+    sin_phi = np.sin(roll)
+    lx, mx, nx = d[:, 0]/L, d[:, 1]/L, d[:, 2]/L
+    x_local = np.stack([lx, mx, nx], axis=1)
+
+    # Can be made prettier using quaternions
+    # the branch not taken may divide by zero, it is discarded by np.where
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # if element is almost vertical
+        vertical = np.abs(mx) > 0.9
+        denominator = np.sqrt(lx*lx + mx*mx)
+        y_vertical = np.stack([
+            (- mx * cos_phi - lx * nx * sin_phi) / denominator,
+            (  lx * cos_phi -  mx * nx * sin_phi) / denominator,
+            denominator * sin_phi
+        ], axis=1)
+        z_vertical = np.stack([
+            ( mx * sin_phi - lx * nx * cos_phi) / denominator,
+            (- lx * sin_phi - mx * nx * cos_phi) / denominator,
+            denominator * cos_phi
+        ], axis=1)
+
+        # if non-vertical
+        denominator = np.sqrt(lx*lx + nx*nx)
+        y_other = np.stack([
+            (- lx * mx *cos_phi - nx * sin_phi) /denominator,
+            denominator * cos_phi,
+            (- mx * nx * cos_phi +  lx * sin_phi) /denominator
+        ], axis=1)
+        z_other = np.stack([
+            (lx * mx * sin_phi - nx * cos_phi) /denominator,
+            - denominator * sin_phi,
+            (mx * nx * sin_phi + lx * cos_phi) /denominator
+        ], axis=1)
+
+    y_local = np.where(vertical[:, None], y_vertical, y_other)
+    z_local = np.where(vertical[:, None], z_vertical, z_other)
+    return x_local, y_local, z_local
+
+def kernel_properties(ids, d, roll, releases, E, G, A, Iy, Iz, J):
+    """
+    Inputs of the element batch kernels, one entry per element.\n
+    d: (n, 3) node j - node i coordinate differences, roll: (n,) radians,
+    releases: (n,) bitmask of released local DOFs (0-11)\n
+    Adds the lengths L (n,) and rotation matrices R (n, 3, 3).
+    Raises ElementError on zero length.
+    """
+    L = np.sqrt(np.sum(d*d, axis=1))
+    for n in np.flatnonzero(L <= 0.0):
+        raise ElementError(
+            f"Element {ids[n]} has zero or negative length."
+        )
+
+    return {
+        "E": E, "G": G, "A": A, "Iy": Iy, "Iz": Iz, "J": J,
+        "L": L,
+        "R": np.stack(local_axes_batch(d, roll), axis=1),
+        "releases": releases
+    }
+
+def element_properties(elements):
+    """
+    Batch kernel inputs gathered from element objects, see kernel_properties.
+    Models use ElementTable.properties() instead.
+    """
+    def column(get):
+        return np.array([get(e) for e in elements], dtype=float)
+    
+    return kernel_properties(
+        ids = [e.id for e in elements],
+        d = np.array([
+            [e.j.x - e.i.x, e.j.y - e.i.y, e.j.z - e.i.z] for e in elements
+        ]).reshape(-1, 3),
+        roll = column(lambda e: e.roll),
+        releases = np.array([e.released_mask() for e in elements], dtype=np.uint16),
+        E  = column(lambda e: e.material.E),
+        G  = column(lambda e: e.material.G),
+        A  = column(lambda e: e.section.area),
+        Iy = column(lambda e: e.section.Iyy), # weak axis is bending about y
+        Iz = column(lambda e: e.section.Ixx), # strong axis is bending about z
+        J  = column(lambda e: e.section.J)
+    )
+
+def station_values(x, value):
+    """
+    Broadcasts an internal force value to the shape of the stations x,
+    a float for a scalar station.
+    """
+    value = np.broadcast_to(value, np.shape(x))
+    return float(value) if value.ndim == 0 else np.array(value)
+
+_dof_maps = {}  # element type -> local_dof_map, shared by all its elements
+
 class Element:
     NODE_DOF_INDICES = []
     LOCAL_DOFS_PER_NODE = [] # Element declares DOFs    
@@ -21,13 +122,21 @@ class Element:
     def __init__(self, element_id: str, 
                  node_i: Node, node_j: Node, 
                  material, section, roll_radians: float = 0.0):
-        # Element properties
+        self._models = []  # models this element belongs to
+
+        # Geometry cache, see _cached_geometry()
+        self._geometry_key = None
+        self._geometry_cache = {}
+        self.geometry_cache_hits = 0
+
+        # Element properties, set directly: a new element is in no model
+        # or table yet, so the setters would have nothing to update
         self.id = element_id
-        self.i = node_i        # start node
-        self.j = node_j        # end node
-        self.material = material
-        self.section = section
-        self.roll = roll_radians 
+        self._i = node_i       # start node
+        self._j = node_j       # end node
+        self._material = material
+        self._section = section
+        self._roll = roll_radians 
 
         # Loads and reactions
         self.loads = []
@@ -35,9 +144,6 @@ class Element:
         self.end_forces_local  = None
         self.end_forces_global = None
 
-        # Helper properties
-        self.dofs_to_vector_index = local_dof_map(self)
-
         # Error handling
         if self.material is None:
             raise ModelDefinitionError(
@@ -49,6 +155,75 @@ class Element:
                 f"Element {self.id} has no section assigned."
             )
 
+    def _modified(self):
+        # invalidate preprocessed data of every model holding this element
+        for model in self._models:
+            model._invalidate()
+
+    def _properties_modified(self):
+        # stiffness-only change, every model holding the element updates its
+        # ElementTable row and applies it incrementally (Model.update_elements)
+        for model in self._models:
+            model._element_properties_changed(self)
+
+    # --------------------------------
+    # PROPERTIES
+    # --------------------------------
+    # geometry setters invalidate every model holding the element,
+    # material/section setters keep the models' ElementTables in sync
+    @property
+    def i(self) -> Node:
+        return self._i
+    @i.setter
+    def i(self, node: Node):
+        self._i = node
+        self._modified()
+
+    @property
+    def j(self) -> Node:
+        return self._j
+    @j.setter
+    def j(self, node: Node):
+        self._j = node
+        self._modified()
+
+    @property
+    def roll(self) -> float:
+        return self._roll
+    @roll.setter
+    def roll(self, value: float):
+        self._roll = value
+        self._geometry_cache = {}
+        self._modified()
+
+    @property
+    def material(self):
+        return self._material
+    @material.setter
+    def material(self, value):
+        self._material = value
+        self._properties_modified()
+
+    @property
+    def section(self):
+        return self._section
+    @section.setter
+    def section(self, value):
+        self._section = value
+        self._properties_modified()
+
+    @property
+    def dofs_to_vector_index(self):
+        if type(self) not in _dof_maps:
+            _dof_maps[type(self)] = local_dof_map(self)
+        return _dof_maps[type(self)]
+
+    def released_mask(self) -> int:
+        """
+        Bitmask of the released local DOFs (0-11), 0 if the element has no releases.
+        """
+        return 0
+
     @property
     def numberOfDOFs(self):
         return len(self.NODE_DOF_INDICES) * 2
@@ -57,7 +232,32 @@ class Element:
     # GEOMETRY
     # --------------------------------
     #region
+    def _cached_geometry(self, name, compute):
+        """
+        Returns the cached geometric quantity name, computed once by compute().\n
+        The cache is dropped when an end node moves (Node._version), the
+        end nodes are replaced or the roll angle changes. Cached arrays are
+        read-only. Every reuse is counted in self.geometry_cache_hits.
+        """
+        key = (self.i, self.i._version, self.j, self.j._version)
+        if key != self._geometry_key:
+            self._geometry_key = key
+            self._geometry_cache = {}
+
+        if name in self._geometry_cache:
+            self.geometry_cache_hits += 1
+        else:
+            value = compute()
+            for array in value if isinstance(value, tuple) else (value,):
+                if isinstance(array, np.ndarray):
+                    array.setflags(write=False)
+            self._geometry_cache[name] = value
+        return self._geometry_cache[name]
+
     def length(self) -> float:
+        return self._cached_geometry("L", self._compute_length)
+
+    def _compute_length(self) -> float:
         dx = self.j.x - self.i.x
         dy = self.j.y - self.i.y
         dz = self.j.z - self.i.z
@@ -69,48 +269,16 @@ class Element:
         return L
     
     def local_axes(self):
-        L = self.length()
-        cos_phi = np.cos(self.roll)
-        sin_phi = np.sin(self.roll)
-
-        lx = (self.j.x - self.i.x)/L
-        mx = (self.j.y - self.i.y)/L
-        nx = (self.j.z - self.i.z)/L
-        x_local = np.array([lx, mx, nx])
-
-        ref_vector = np.array([0.0, 1.0, 0.0])
-       
-        # Can be made prettier using quaternions
-        if abs(np.dot(x_local, ref_vector))> 0.9:  # if element is almost vertical
-            denominator = sqrt(lx*lx + mx*mx)
-            y_local =  np.array([
-                (- mx * cos_phi - lx * nx * sin_phi) / denominator,
-                (  lx * cos_phi -  mx * nx * sin_phi) / denominator,
-                denominator * sin_phi
-            ])
-            z_local =  np.array([
-                ( mx * sin_phi - lx * nx * cos_phi) / denominator,
-                (- lx * sin_phi - mx * nx * cos_phi) / denominator,
-                denominator * cos_phi
-            ])
-        else: # if non-vertical
-            denominator = sqrt(lx*lx + nx*nx)
-            y_local = np.array([
-                (- lx * mx *cos_phi - nx * sin_phi) /denominator,
-                denominator * cos_phi,
-                (- mx * nx * cos_phi +  lx * sin_phi) /denominator
-            ])
-            z_local = np.array([
-                (lx * mx * sin_phi - nx * cos_phi) /denominator,
-                - denominator * sin_phi,
-                (mx * nx * sin_phi + lx * cos_phi) /denominator
-            ])
-
-        return x_local, y_local, z_local
+        return self._cached_geometry("axes", self._compute_local_axes)
+
+    def _compute_local_axes(self):
+        self.length()   # raises on zero length
+        d = np.array([[self.j.x - self.i.x, self.j.y - self.i.y, self.j.z - self.i.z]])
+        x_local, y_local, z_local = local_axes_batch(d, np.array([self.roll]))
+        return x_local[0].copy(), y_local[0].copy(), z_local[0].copy()
 
     def rotation_matrix(self): #3x3
-        x, y, z = self.local_axes()
-        return np.vstack([x, y, z])
+        return self._cached_geometry("R", lambda: np.vstack(self.local_axes()))
     #endregion
 
     # ---------------------------------------------
@@ -128,6 +296,42 @@ class Element:
     def global_stiffness(self):
         pass
 
+    @classmethod
+    @abstractmethod
+    def batch_transformation(cls, R):
+        """
+        Transformation matrices from rotation matrices R (n, 3, 3), (n, nd_local, nd).
+        """
+        pass
+    
+    @classmethod
+    @abstractmethod
+    def batch_local_stiffness(cls, props):
+        """
+        Local stiffness matrices, (n, nd_local, nd_local).
+        props: batch kernel inputs, see kernel_properties
+        """
+        pass
+
+    @classmethod
+    def batch_element_matrices(cls, props, elements=None):
+        """
+        Transformation matrices T and the local stiffness matrices used for
+        assembly and end forces (releases condensed), see kernel_properties.\n
+        elements: the element objects of the rows of props, element types
+        with releases keep their condensations on them (see Frame).
+        """
+        return cls.batch_transformation(props["R"]), cls.batch_local_stiffness(props)
+
+    @classmethod
+    def batch_global_stiffness(cls, props):
+        """
+        Global stiffness matrices of n elements of this type, (n, nd, nd).
+        props: batch kernel inputs, see kernel_properties
+        """
+        T, k_local = cls.batch_element_matrices(props)
+        return T.transpose(0, 2, 1) @ k_local @ T
+
     def get_dof_indices(self):
         dofs = []
         for node in (self.i, self.j):
@@ -188,51 +392,41 @@ class Element:
     # INTERNAL FORCE ACCESSORS
     # --------------------------------
     #region
+    # x is a station (distance from node i) or an array of stations,
+    # results have the shape of x
     # AXIAL
-    def Nx_internal(self, x) -> float:
+    def Nx_internal(self, x):
         Nx_NODE_i = self.Nx_i
-        Nx_LOAD = 0.0
-        for elementLoad in self.loads:
-            Nx_LOAD += elementLoad.axial(x, self)
-        return -(Nx_NODE_i + Nx_LOAD)    
+        Nx_LOAD = sum(elementLoad.axial(x, self) for elementLoad in self.loads)
+        return station_values(x, -(Nx_NODE_i + Nx_LOAD))
     
     # SHEAR
-    def Vy_internal(self, x) -> float:
+    def Vy_internal(self, x):
         Vy_NODE_i = self.Vy_i
-        Vy_LOAD = 0.0
-        for elementLoad in self.loads:
-            Vy_LOAD += elementLoad.shear_y(x, self)
-        return Vy_NODE_i + Vy_LOAD 
+        Vy_LOAD = sum(elementLoad.shear_y(x, self) for elementLoad in self.loads)
+        return station_values(x, Vy_NODE_i + Vy_LOAD)
 
-    def Vz_internal(self, x) -> float:
+    def Vz_internal(self, x):
         Vz_NODE_i = self.Vz_i
-        Vz_LOAD = 0.0
-        for elementLoad in self.loads:
-            Vz_LOAD += elementLoad.shear_z(x, self)
-        return Vz_NODE_i + Vz_LOAD 
+        Vz_LOAD = sum(elementLoad.shear_z(x, self) for elementLoad in self.loads)
+        return station_values(x, Vz_NODE_i + Vz_LOAD)
 
     # BENDING    
-    def My_internal(self, x) -> float:
-        My_NODE_i = self.My_i + self.Vz_i * x
-        My_LOAD = 0.0
-        for elementLoad in self.loads:
-            My_LOAD += elementLoad.moment_y(x, self)
-        return My_NODE_i + My_LOAD 
-
-    def Mz_internal(self, x) -> float:
-        Mz_NODE_i = self.Mz_i - self.Vy_i * x
-        Mz_LOAD = 0.0
-        for elementLoad in self.loads:
-            Mz_LOAD += elementLoad.moment_z(x, self)
-        return -(Mz_NODE_i + Mz_LOAD) 
+    def My_internal(self, x):
+        My_NODE_i = self.My_i + self.Vz_i * np.asarray(x)
+        My_LOAD = sum(elementLoad.moment_y(x, self) for elementLoad in self.loads)
+        return station_values(x, My_NODE_i + My_LOAD)
+
+    def Mz_internal(self, x):
+        Mz_NODE_i = self.Mz_i - self.Vy_i * np.asarray(x)
+        Mz_LOAD = sum(elementLoad.moment_z(x, self) for elementLoad in self.loads)
+        return station_values(x, -(Mz_NODE_i - Mz_LOAD))
 
     # TORSION
-    def Tx_internal(self, x) -> float:
+    def Tx_internal(self, x):
         Tx_NODE_i = self.Tx_i
-        Tx_LOAD = 0.0
-        for elementLoad in self.loads:
-            Tx_LOAD += elementLoad.torsion(x, self)
-        return -(Tx_NODE_i + Tx_LOAD)
+        Tx_LOAD = sum(elementLoad.torsion(x, self) for elementLoad in self.loads)
+        return station_values(x, -(Tx_NODE_i + Tx_LOAD))
     #endregion
     
     # --------------------------------
@@ -242,31 +436,31 @@ class Element:
 
     # AXIAL 
     # AXIAL STRESS P/A
-    def axial_stress(self, x) -> float:
+    def axial_stress(self, x):
         # positive if tension, negative if compression
         return self.Nx_internal(x) / self.section.area
     
     # BENDING STRESS Mc/I
-    def bending_stress_about_y(self, x, c_z) -> float:
+    def bending_stress_about_y(self, x, c_z):
         """
         Returns the bending stress about the y-axis
         
         :param x: Length along the member
         :param c_z: Distance from the neutral axis
         :return: Bending Stress taken about local y-axis
-        :rtype: float
+        :rtype: float, or an array for an array of stations x
         """
         # if positive bending, +z is in compression, should return negative
         return self.My_internal(x) * (-c_z)/self.section.Iyy 
     
-    def bending_stress_about_z(self, x, c_y) -> float:
+    def bending_stress_about_z(self, x, c_y):
         """
         Returns the bending stress about the z-axis
         
         :param x: Length along the member
         :param c_y: Distance from the neutral axis
         :return: Bending Stress taken about local z-axis
-        :rtype: float
+        :rtype: float, or an array for an array of stations x
         """
         # if positive bending, +y is in compression, should return negative
         return self.Mz_internal(x)  * (-c_y)/self.section.Ixx 
@@ -279,7 +473,7 @@ class Element:
         return F_a + F_b_y + F_b_z
     # SHEAR
     # SIMPLE SHEAR STRESS V/A
-    def simple_shear_stress_along_y(self, x) -> float:
+    def simple_shear_stress_along_y(self, x):
         return self.Vy_internal(x) / self.section.area 
     # BENDING SHEAR STRESS VQ/Ib
     # TORSIONAL SHEAR STRESS Tr/J
@@ -0,0 +1,149 @@
+# src/model/geometry/bulk.py
+
+import numpy as np
+from src.utils.exceptions import ModelDefinitionError, ElementError
+from src.utils.helpers import paused_gc
+from src.model.model import Model
+from src.model.geometry.node import Node
+from src.model.elements.truss import Truss
+
+def _as_ids(ids):
+    # numpy integers/strings become int/str, IDs end up in JSON metadata
+    if isinstance(ids, np.ndarray):
+        return ids.tolist()
+    return [i.item() if isinstance(i, np.generic) else i for i in ids]
+
+def _check_ids(ids, existing, kind):
+    # duplicates within ids and against the IDs already in the model
+    if len(set(ids)) != len(ids):
+        seen = set()
+        duplicate = next(i for i in ids if i in seen or seen.add(i))
+        raise ModelDefinitionError(f"Duplicate {kind} ID detected: {duplicate}")
+    clashes = [i for i in ids if i in existing] if existing else []
+    if clashes:
+        raise ModelDefinitionError(f"Duplicate {kind} ID detected: {clashes[0]}")
+
+def _check_index(index, size, name):
+    index = np.asarray(index)
+    if index.ndim != 1 or not np.issubdtype(index.dtype, np.integer):
+        raise ModelDefinitionError(f"{name} must be a 1D integer array")
+    bad = (index < 0) | (index >= size)
+    if np.any(bad):
+        raise ModelDefinitionError(
+            f"{name}[{np.argmax(bad)}] = {index[np.argmax(bad)]} is out of range (0-{size - 1})"
+        )
+    return index
+
+def add_nodes(model:Model, ids, xyz):
+    """
+    Adds len(ids) nodes with coordinates xyz (n, 3) or (n, 2), z = 0.
+    IDs and coordinates are validated for all nodes at once.
+    """
+    ids = _as_ids(ids)
+    xyz = np.asarray(xyz, dtype=float)
+    if xyz.ndim != 2 or xyz.shape[1] not in (2, 3) or len(xyz) != len(ids):
+        raise ModelDefinitionError(
+            f"xyz must have shape ({len(ids)}, 3), got {xyz.shape}"
+        )
+    if not np.all(np.isfinite(xyz)):
+        row = np.argmax(~np.all(np.isfinite(xyz), axis=1))
+        raise ModelDefinitionError(f"Node {ids[row]}: coordinates are not finite")
+    _check_ids(ids, model.node, "node")
+
+    if xyz.shape[1] == 2:
+        xyz = np.hstack([xyz, np.zeros((len(xyz), 1))])
+    with paused_gc():
+        nodes = [Node(node_id, x, y, z) for node_id, (x, y, z) in zip(ids, xyz.tolist())]
+        for node in nodes:
+            node._models.append(model)
+    model.node.update(zip(ids, nodes))
+    model._invalidate()
+    return nodes
+
+def add_elements(model:Model, element_type, ids, i_idx, j_idx, mat_idx, sec_idx,
+                 roll=None, materials=None, sections=None):
+    """
+    Adds len(ids) elements of element_type (Frame, Beam or Truss).\n
+    i_idx, j_idx: end node rows, in the order nodes were added to the model\n
+    mat_idx, sec_idx: rows of materials/sections (default: the materials and
+    sections registered with Model.add_material/add_section)\n
+    roll: (n,) radians, default 0.0 (not used by Truss)\n
+    Indices, IDs and member lengths are validated for all elements at once.
+    """
+    ids = _as_ids(ids)
+    n = len(ids)
+    materials = list(model.material.values()) if materials is None else list(materials)
+    sections = list(model.section.values()) if sections is None else list(sections)
+    nodes = list(model.node.values())
+
+    i_idx = _check_index(i_idx, len(nodes), "i_idx")
+    j_idx = _check_index(j_idx, len(nodes), "j_idx")
+    mat_idx = _check_index(np.broadcast_to(mat_idx, (n,)), len(materials), "mat_idx")
+    sec_idx = _check_index(np.broadcast_to(sec_idx, (n,)), len(sections), "sec_idx")
+    roll = np.zeros(n) if roll is None else np.broadcast_to(np.asarray(roll, dtype=float), (n,))
+    if not (len(i_idx) == len(j_idx) == n):
+        raise ModelDefinitionError(f"i_idx and j_idx must have length {n}")
+    _check_ids(ids, model.element, "element")
+
+    # coordinates of the referenced nodes only, models grow in chunks
+    rows, ends = np.unique(np.concatenate([i_idx, j_idx]), return_inverse=True)
+    xyz = np.array([nodes[row]._xyz for row in rows.tolist()]).reshape(-1, 3)[ends]
+    L = np.linalg.norm(xyz[n:] - xyz[:n], axis=1)
+    if np.any(L <= 0.0):
+        raise ElementError(f"Element {ids[np.argmax(L <= 0.0)]} has zero length.")
+
+    if element_type is Truss and np.any(roll != 0.0):
+        raise ModelDefinitionError("Truss elements have no roll angle")
+
+    with paused_gc():
+        if element_type is Truss:
+            elements = [
+                Truss(element_id, nodes[i], nodes[j], materials[m], sections[s])
+                for element_id, i, j, m, s in zip(
+                    ids, i_idx.tolist(), j_idx.tolist(), mat_idx.tolist(), sec_idx.tolist()
+                )
+            ]
+        else:
+            elements = [
+                element_type(element_id, nodes[i], nodes[j], materials[m], sections[s], r)
+                for element_id, i, j, m, s, r in zip(
+                    ids, i_idx.tolist(), j_idx.tolist(), mat_idx.tolist(), sec_idx.tolist(), roll.tolist()
+                )
+            ]
+        for element in elements:
+            element._models.append(model)
+    model.element.update(zip(ids, elements))
+    model._invalidate()
+    return elements
+
+def restrain_many(model:Model, node_ids, dofs):
+    """
+    Restrains DOFs of many nodes.\n
+    dofs: a list of DOFs (0-5) restrained at every node, or an (n, 6)
+    boolean mask, one row per node.
+    """
+    node_ids = list(node_ids)
+    missing = [node_id for node_id in node_ids if node_id not in model.node]
+    if missing:
+        raise ModelDefinitionError(f"Node {missing[0]} is not in the model")
+
+    mask = np.asarray(dofs)
+    if mask.dtype != bool:
+        dofs = np.asarray(dofs, dtype=int).ravel()
+        if np.any((dofs < 0) | (dofs > 5)):
+            raise ValueError(f"Invalid DOF in {dofs.tolist()}, DOFs are 0-5")
+        mask = np.zeros((len(node_ids), 6), dtype=bool)
+        mask[:, dofs] = True
+    if mask.shape != (len(node_ids), 6):
+        raise ValueError(f"DOF mask must have shape ({len(node_ids)}, 6), got {mask.shape}")
+
+    models = {}
+    for node_id, row in zip(node_ids, mask.tolist()):
+        node = model.node[node_id]
+        for dof, restrained in enumerate(row):
+            if restrained:
+                node.restraints[dof] = True
+        for node_model in node._models:
+            models[id(node_model)] = node_model
+    for node_model in models.values():
+        node_model._invalidate()
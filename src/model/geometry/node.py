@@ -1,21 +1,73 @@
 # src/model/geometry/node.py
 
+import numpy as np
+
 class Node:
     def __init__(self, node_id: 
                  int, x: float, y: float, z: float = 0.0):
+        self._models = []  # models this node belongs to
+        self._table = None # NodeTable and row, once the model built its tables
+        self._row = None
+        self._xyz = np.array([x, y, z], dtype=float)
+        self._version = 0  # bumped on every coordinate change (element geometry caches)
+        self._load_cases = None  # load cases with nodal loads on this node, see LoadCase
         self.id = node_id
-        self.x, self.y, self.z = x, y, z
 
         self.dofs = {}  # Model-level DOF index 
         self.restraints = {}
         self.loads = {}
 
-        self.displacements = {}
-        self.reactions = {}
+        self._displacements = {}
+        self._reactions = {}
+        # NodeTable solution last copied into each dictionary
+        self._solution = {"displacements": 0, "reactions": 0}
         
+    def _modified(self):
+        # invalidate preprocessed data of every model holding this node
+        for model in self._models:
+            model._invalidate()
+
+    def _attach(self, table, row):
+        # coordinates become a view of the row in the NodeTable
+        table.xyz[row] = self._xyz
+        self._table = table
+        self._row = row
+        self._xyz = table.xyz[row]
+        self._solution = dict.fromkeys(self._solution, table.solution)
+
+    # --------------------------------
+    # COORDINATES
+    # --------------------------------
+    @property
+    def x(self) -> float:
+        return float(self._xyz[0])
+    @x.setter
+    def x(self, value: float):
+        self._xyz[0] = value
+        self._version += 1
+        self._modified()
+
+    @property
+    def y(self) -> float:
+        return float(self._xyz[1])
+    @y.setter
+    def y(self, value: float):
+        self._xyz[1] = value
+        self._version += 1
+        self._modified()
+
+    @property
+    def z(self) -> float:
+        return float(self._xyz[2])
+    @z.setter
+    def z(self, value: float):
+        self._xyz[2] = value
+        self._version += 1
+        self._modified()
 
     def restrain(self, dof_name):
         self.restraints[dof_name] = True
+        self._modified()
 
     def add_load(self, dof_name: int, value: float):
         self.loads[dof_name] = self.loads.get(dof_name, 0.0) + value
@@ -25,6 +77,46 @@ class Node:
         self.displacements = {}
         self.reactions = {}
 
+    # --------------------------------
+    # RESULTS
+    # --------------------------------
+    # Solves write the NodeTable result arrays, the dictionaries are
+    # only filled from them when a node's results are queried
+    def _pending(self, name) -> bool:
+        # True if the NodeTable holds results newer than the dictionary
+        table = self._table
+        if table is None or self._solution[name] == table.solution:
+            return False
+        self._solution[name] = table.solution
+        return True
+
+    @property
+    def displacements(self) -> dict:
+        if self._pending("displacements"):
+            for dof in self.dofs:
+                self._displacements[dof] = float(
+                    self._table.displacements[self._row, dof]
+                )
+        return self._displacements
+    @displacements.setter
+    def displacements(self, value: dict):
+        self._pending("displacements")  # drops pending results
+        self._displacements = value
+
+    @property
+    def reactions(self) -> dict:
+        if self._pending("reactions"):
+            for dof in self.dofs:
+                if self.restraints.get(dof, False):
+                    self._reactions[dof] = float(
+                        self._table.reactions[self._row, dof]
+                    )
+        return self._reactions
+    @reactions.setter
+    def reactions(self, value: dict):
+        self._pending("reactions")
+        self._reactions = value
+
     # --------------------------------
     # QUERYING API
     # --------------------------------
@@ -32,4 +124,4 @@ class Node:
         return self.displacements[dof]
 
     def REACTION(self, dof):
-        return self.reactions[dof]
\ No newline at end of file
+        return self.reactions[dof]
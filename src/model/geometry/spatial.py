@@ -0,0 +1,112 @@
+# src/model/geometry/spatial.py
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from src.utils.exceptions import ModelDefinitionError
+from src.model.model import Model
+
+def node_tree(model:Model):
+    """
+    KD-tree over the node coordinates (NodeTable rows), built in O(n log n).
+    """
+    model.build_tables()
+    return cKDTree(model.node_table.xyz)
+
+def find_nodes_near(model:Model, points, radius):
+    """
+    IDs of the nodes within radius of point (3,), sorted by distance.
+    For points (m, 3) returns one list per point.
+    """
+    points = np.asarray(points, dtype=float)
+    single = points.ndim == 1
+    points = points.reshape(-1, 3)
+
+    tree = node_tree(model)
+    xyz = model.node_table.xyz
+    ids = model.node_table.ids
+    found = []
+    for point, rows in zip(points, tree.query_ball_point(points, radius)):
+        rows = np.array(rows, dtype=int)
+        rows = rows[np.argsort(np.linalg.norm(xyz[rows] - point, axis=1), kind="stable")]
+        found.append([ids[row] for row in rows.tolist()])
+    return found[0] if single else found
+
+def coincident_groups(model:Model, tol):
+    """
+    Row of the node every node is merged into: nodes closer than tol are
+    grouped (transitively) and every group is represented by the node
+    added to the model first. (n,) array of NodeTable rows.
+    """
+    tree = node_tree(model)
+    n = len(model.node_table)
+    pairs = tree.query_pairs(tol, output_type="ndarray")
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+
+    keep = np.full(labels.max(initial=-1) + 1, n)
+    np.minimum.at(keep, labels, np.arange(n))
+    return keep[labels]
+
+def merge_coincident_nodes(model:Model, tol=1e-6):
+    """
+    Merges nodes closer than tol into the node of their group added first
+    and remaps the element ends. Restraints of merged nodes are added to
+    the kept node, nodal loads on merged nodes are moved to it (in every
+    load case that loads them, see LoadCase, and in model.load_cases).\n
+    Returns {removed node id: kept node id}.
+    """
+    target = coincident_groups(model, tol)
+    nodes = model.node_table
+    rows = np.arange(len(nodes))
+    merged = np.flatnonzero(target != rows)
+    if len(merged) == 0:
+        return {}
+
+    elements = model.element_table
+    new_i, new_j = target[elements.i], target[elements.j]
+    collapsed = np.flatnonzero(new_i == new_j)
+    if len(collapsed) > 0:
+        raise ModelDefinitionError(
+            f"Merging nodes within {tol} collapses element "
+            f"{elements.ids[collapsed[0]]} (and {len(collapsed) - 1} more) to zero length."
+        )
+
+    node_list = list(model.node.values())
+    element_list = list(model.element.values())
+    for e in np.flatnonzero((new_i != elements.i) | (new_j != elements.j)).tolist():
+        element = element_list[e]
+        element.i = node_list[new_i[e]]
+        element.j = node_list[new_j[e]]
+
+    # union of the restraints of every group
+    restraints = np.zeros(len(nodes), dtype=np.uint8)
+    np.bitwise_or.at(restraints, target[merged], nodes.restraints[merged])
+    for row in np.flatnonzero(restraints & ~nodes.restraints).tolist():
+        for dof in range(6):
+            if restraints[row] >> dof & 1:
+                node_list[row].restrain(dof)
+
+    mapping = {}
+    for row in merged.tolist():
+        node = node_list[row]
+        mapping[node.id] = node_list[target[row]].id
+        del model.node[node.id]
+        node._models.remove(model)
+
+    # nodal loads of the load cases registered on the removed nodes
+    removed = {id(node_list[row]): node_list[target[row]] for row in merged.tolist()}
+    load_cases = {id(load_case): load_case for load_case in model.load_cases.values()}
+    for row in merged.tolist():
+        for load_case in node_list[row]._load_cases or ():
+            load_cases[id(load_case)] = load_case
+    for load_case in load_cases.values():
+        for load in load_case.nodalLoads:
+            if id(load.node) in removed:
+                kept = removed[id(load.node)]
+                load.node = kept
+                load_case._register(kept)
+
+    model._invalidate()
+    return mapping
@@ -0,0 +1,149 @@
+# src/model/geometry/tables.py
+
+import numpy as np
+from src.model.geometry.base_element import kernel_properties
+
+class NodeTable:
+    """
+    Structure-of-arrays snapshot of the nodes of a model for preprocessing,
+    one row per node in insertion order. Rebuilt whenever the model is
+    invalidated, the Node objects stay the source of truth.\n
+    xyz: (n, 3) coordinates, Node.x/y/z are views of their rows\n
+    restraints: (n,) bitmask copied from the nodes, bit dof is set if the
+    DOF is restrained\n
+    displacements, reactions: (n, 6) results of the last solve, solution
+    counts the solves (nodes copy results into their dictionaries lazily)
+    """
+    def __init__(self, nodes):
+        nodes = list(nodes)
+        self.ids = [node.id for node in nodes]
+        self.index = {node_id: row for row, node_id in enumerate(self.ids)}
+
+        self.xyz = np.concatenate(
+            [np.zeros(0)] + [node._xyz for node in nodes]
+        ).reshape(-1, 3)
+
+        self.restraints = np.zeros(len(nodes), dtype=np.uint8)
+        for row, node in enumerate(nodes):
+            for dof, restrained in node.restraints.items():
+                if restrained:
+                    self.restraints[row] |= 1 << dof
+
+        self.displacements = np.zeros((len(nodes), 6))
+        self.reactions = np.zeros((len(nodes), 6))
+        self.solution = 0
+
+        for row, node in enumerate(nodes):
+            node._attach(self, row)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def store_results(self, displacements, reactions):
+        """
+        Stores the (n, 6) results of a solve, node dictionaries are
+        refreshed on their next access.
+        """
+        self.displacements = displacements
+        self.reactions = reactions
+        self.solution += 1
+
+    def restrained(self):
+        """
+        (n, 6) boolean mask of the restrained DOFs.
+        """
+        return (self.restraints[:, None] >> np.arange(6)) & 1 == 1
+
+class ElementTable:
+    """
+    Structure-of-arrays snapshot of the elements of a model for
+    preprocessing, one row per element in insertion order. The rows are
+    copies, rebuilt whenever the model is invalidated.\n
+    types: distinct element classes, type_code: (n,) index into types\n
+    i, j: (n,) NodeTable rows of the end nodes\n
+    materials, sections: distinct objects, material_index, section_index: (n,)\n
+    roll: (n,) radians, releases: (n,) bitmask of released local DOFs (0-11)
+    """
+    def __init__(self, elements, node_table):
+        elements = list(elements)
+        self.ids = [element.id for element in elements]
+        self.index = {element_id: row for row, element_id in enumerate(self.ids)}
+
+        self.types = list(dict.fromkeys(type(element) for element in elements))
+        self.type_code = np.array(
+            [self.types.index(type(element)) for element in elements], dtype=int
+        )
+
+        self.i = np.array([node_table.index[e.i.id] for e in elements], dtype=int)
+        self.j = np.array([node_table.index[e.j.id] for e in elements], dtype=int)
+
+        self.materials, self._material_rows = [], {}
+        self.sections, self._section_rows = [], {}
+        self.material_index = np.array(
+            [self._lookup(e.material, self.materials, self._material_rows) for e in elements],
+            dtype=int
+        )
+        self.section_index = np.array(
+            [self._lookup(e.section, self.sections, self._section_rows) for e in elements],
+            dtype=int
+        )
+
+        self.roll = np.array([element.roll for element in elements], dtype=float)
+        self.releases = np.array(
+            [element.released_mask() for element in elements], dtype=np.uint16
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _lookup(obj, objects, rows):
+        # row of obj in objects, appended if new (compared by identity)
+        if id(obj) not in rows:
+            rows[id(obj)] = len(objects)
+            objects.append(obj)
+        return rows[id(obj)]
+
+    def set_material(self, row, material):
+        self.material_index[row] = self._lookup(
+            material, self.materials, self._material_rows
+        )
+
+    def set_section(self, row, section):
+        self.section_index[row] = self._lookup(
+            section, self.sections, self._section_rows
+        )
+
+    def rows_by_type(self):
+        """
+        Element class -> rows of the elements of that class.
+        """
+        return {
+            element_type: np.flatnonzero(self.type_code == code)
+            for code, element_type in enumerate(self.types)
+        }
+
+    def properties(self, rows, node_table):
+        """
+        Batch kernel inputs of the elements in rows, see kernel_properties.
+        """
+        materials = self.material_index[rows]
+        sections = self.section_index[rows]
+
+        def material(attr):
+            return np.array([getattr(m, attr) for m in self.materials], dtype=float)[materials]
+        def section(attr):
+            return np.array([getattr(s, attr) for s in self.sections], dtype=float)[sections]
+
+        return kernel_properties(
+            ids = [self.ids[row] for row in rows],
+            d = node_table.xyz[self.j[rows]] - node_table.xyz[self.i[rows]],
+            roll = self.roll[rows],
+            releases = self.releases[rows],
+            E  = material("E"),
+            G  = material("G"),
+            A  = section("area"),
+            Iy = section("Iyy"), # weak axis is bending about y
+            Iz = section("Ixx"), # strong axis is bending about z
+            J  = section("J")
+        )
@@ -0,0 +1,248 @@
+# src/model/io/binary.py
+
+import json
+import numpy as np
+from src.utils.exceptions import ModelDefinitionError
+from src.utils.helpers import paused_gc
+from src.model.model import Model
+from src.model.geometry.node import Node
+from src.model.elements.truss import Truss
+from src.model.elements.frame import Frame
+from src.model.elements.beam import Beam
+from src.model.materials.base_material import Material
+from src.model.sections.base_section import Section
+from src.model.loads.load_case import LoadCase
+from src.model.loads.load_combo import LoadCombination
+from src.model.loads.nodal_load import NodalLoad
+from src.model.loads.element_load import UDL, SlfWgt, PntLd
+
+FORMAT_VERSION = 1
+
+ELEMENT_TYPES = {cls.__name__: cls for cls in (Truss, Frame, Beam)}
+
+# Element load kinds, load arrays hold (local, a, x, y, z) per load
+ELEMENT_LOAD_KINDS = [UDL, SlfWgt, PntLd]
+
+def _objects(objects):
+    # distinct objects (by identity) in first-seen order, object id -> row
+    rows = {}
+    unique = []
+    for obj in objects:
+        if id(obj) not in rows:
+            rows[id(obj)] = len(unique)
+            unique.append(obj)
+    return unique, rows
+
+def save_model(model:Model, path, load_combos=None, load_cases=()):
+    """
+    Writes the model to an uncompressed .npz archive.\n
+    Numeric data (coordinates, restraint and release bitmasks, connectivity,
+    material/section properties, loads) is stored as flat arrays, IDs and
+    names as one JSON string.\n
+    load_combos: combinations to store, default model.load_combos. Their load
+    cases are stored with them, load_cases adds cases used by no combination.
+    """
+    if load_combos is None:
+        load_combos = list(model.load_combos.values())
+    nodes = list(model.node.values())
+    elements = list(model.element.values())
+    node_rows = {id(node): n for n, node in enumerate(nodes)}
+    element_rows = {id(element): e for e, element in enumerate(elements)}
+
+    for element in elements:
+        if type(element).__name__ not in ELEMENT_TYPES:
+            raise ModelDefinitionError(
+                f"Element {element.id}: type {type(element).__name__} cannot be saved."
+            )
+    element_types = list(ELEMENT_TYPES)
+    materials, material_rows = _objects(
+        [*model.material.values(), *(element.material for element in elements)]
+    )
+    sections, section_rows = _objects(
+        [*model.section.values(), *(element.section for element in elements)]
+    )
+
+    restraints = np.zeros(len(nodes), dtype=np.uint8)
+    for n, node in enumerate(nodes):
+        for dof, restrained in node.restraints.items():
+            if restrained:
+                restraints[n] |= 1 << dof
+
+    # Load cases of the combinations first, then the extra ones
+    cases, case_rows = _objects(
+        [*(lc for combo in load_combos for lc in combo.loadCaseAndFactors), *load_cases]
+    )
+
+    nodal_loads = []    # (case, node row, dof, magnitude)
+    element_loads = []  # (case, kind, element row, local, a, x, y, z)
+    for c, load_case in enumerate(cases):
+        for load in load_case.nodalLoads:
+            if id(load.node) not in node_rows:
+                raise ModelDefinitionError(
+                    f"Load case {load_case.name}: node {load.node.id} is not in the model."
+                )
+            nodal_loads.append((c, node_rows[id(load.node)], load.dof, load.magnitude))
+
+        for load in load_case.elementLoads:
+            if id(load.element) not in element_rows:
+                raise ModelDefinitionError(
+                    f"Load case {load_case.name}: element {load.element.id} is not in the model."
+                )
+            row = element_rows[id(load.element)]
+            if isinstance(load, UDL):
+                element_loads.append((c, 0, row, load.isLocal, 0.0, load.wx, load.wy, load.wz))
+            elif isinstance(load, SlfWgt):
+                element_loads.append((c, 1, row, True, 0.0, 0.0, 0.0, 0.0))
+            elif isinstance(load, PntLd):
+                element_loads.append((c, 2, row, load.isLocal, load.a, load.px, load.py, load.pz))
+            else:
+                raise ModelDefinitionError(
+                    f"Load case {load_case.name}: {type(load).__name__} cannot be saved."
+                )
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "node_ids": [node.id for node in nodes],
+        "element_ids": [element.id for element in elements],
+        "element_types": element_types,
+        "material_ids": [material.id for material in materials],
+        "section_ids": [section.id for section in sections],
+        # the first materials/sections are the ones registered in the model
+        "registered": [len(model.material), len(model.section)],
+        "load_cases": [load_case.name for load_case in cases],
+        "load_combos": [
+            [combo.name, [[case_rows[id(lc)], factor] for lc, factor in combo.loadCaseAndFactors.items()]]
+            for combo in load_combos
+        ],
+        "analysis": {
+            "preprocessed": model._preprocessed,
+            "reorder": model.reorder,
+            "solver": model.solver,
+            "stability_check": model.stability_check,
+            "cg_options": model.cg_options,
+        },
+    }
+
+    nodal_loads = np.array(nodal_loads, dtype=float).reshape(-1, 4)
+    element_loads = np.array(element_loads, dtype=float).reshape(-1, 8)
+    np.savez(
+        path,
+        meta = np.array(json.dumps(meta)),
+        node_xyz = np.array([node._xyz for node in nodes], dtype=float).reshape(-1, 3),
+        node_restraints = restraints,
+        element_type = np.array([element_types.index(type(e).__name__) for e in elements], dtype=np.int8),
+        element_nodes = np.array(
+            [(node_rows[id(e.i)], node_rows[id(e.j)]) for e in elements], dtype=np.int64
+        ).reshape(-1, 2),
+        element_material = np.array([material_rows[id(e.material)] for e in elements], dtype=np.int64),
+        element_section = np.array([section_rows[id(e.section)] for e in elements], dtype=np.int64),
+        element_roll = np.array([e.roll for e in elements], dtype=float),
+        element_releases = np.array([e.released_mask() for e in elements], dtype=np.uint16),
+        # E, G (nan = from nu), nu, gamma
+        material_props = np.array(
+            [(m.E, np.nan if m._G is None else m._G, m.nu, m.gamma) for m in materials], dtype=float
+        ).reshape(-1, 4),
+        # area, Ixx, Iyy, J
+        section_props = np.array(
+            [(s.area, s.Ixx, s.Iyy, s.J) for s in sections], dtype=float
+        ).reshape(-1, 4),
+        nodal_loads = nodal_loads,
+        element_loads = element_loads,
+    )
+
+def load_model(path, preprocess=True):
+    """
+    Reads a model written by save_model. Load cases and combinations are
+    returned in model.load_cases and model.load_combos (by name).\n
+    preprocess=True: a model saved after preprocess() is preprocessed again
+    with the saved analysis options (full assembly and factorization, the
+    factor is not stored). preprocess=False only reads the model.
+    """
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files}
+    meta = json.loads(str(arrays["meta"]))
+    if meta["version"] != FORMAT_VERSION:
+        raise ModelDefinitionError(
+            f"{path}: unsupported model file version {meta['version']}"
+        )
+
+    with paused_gc():
+        materials = [
+            Material(material_id, E, None if np.isnan(G) else G, nu, gamma)
+            for material_id, (E, G, nu, gamma) in zip(meta["material_ids"], arrays["material_props"].tolist())
+        ]
+        sections = [
+            Section(section_id, area, Ixx, Iyy, J)
+            for section_id, (area, Ixx, Iyy, J) in zip(meta["section_ids"], arrays["section_props"].tolist())
+        ]
+
+        nodes = [
+            Node(node_id, x, y, z)
+            for node_id, (x, y, z) in zip(meta["node_ids"], arrays["node_xyz"].tolist())
+        ]
+        restraints = arrays["node_restraints"]
+        for n in np.flatnonzero(restraints).tolist():
+            for dof in range(6):
+                if restraints[n] >> dof & 1:
+                    nodes[n].restrain(dof)
+
+        types = [ELEMENT_TYPES[name] for name in meta["element_types"]]
+        elements = []
+        for element_id, code, (i, j), mat, sec, roll in zip(
+            meta["element_ids"],
+            arrays["element_type"].tolist(), arrays["element_nodes"].tolist(),
+            arrays["element_material"].tolist(), arrays["element_section"].tolist(),
+            arrays["element_roll"].tolist()
+        ):
+            cls = types[code]
+            if cls is Truss:
+                elements.append(cls(element_id, nodes[i], nodes[j], materials[mat], sections[sec]))
+            else:
+                elements.append(cls(element_id, nodes[i], nodes[j], materials[mat], sections[sec], roll))
+
+        releases = arrays["element_releases"]
+        for e in np.flatnonzero(releases).tolist():
+            for dof in range(12):
+                if releases[e] >> dof & 1:
+                    elements[e].release("i" if dof < 6 else "j", dof % 6)
+
+        model = Model()
+        for node in nodes:
+            model.add_node(node)
+        for element in elements:
+            model.add_element(element)
+        n_materials, n_sections = meta["registered"]
+        for material in materials[:n_materials]:
+            model.material[material.id] = material
+        for section in sections[:n_sections]:
+            model.section[section.id] = section
+
+        cases = [LoadCase(name) for name in meta["load_cases"]]
+        for c, n, dof, magnitude in arrays["nodal_loads"].tolist():
+            cases[int(c)].add_nodal_load(NodalLoad(nodes[int(n)], int(dof), magnitude))
+        for c, kind, e, local, a, x, y, z in arrays["element_loads"].tolist():
+            element = elements[int(e)]
+            load_class = ELEMENT_LOAD_KINDS[int(kind)]
+            if load_class is UDL:
+                load = UDL(element, bool(local), x, y, z)
+            elif load_class is SlfWgt:
+                load = SlfWgt(element)
+            else:
+                load = PntLd(element, a, bool(local), x, y, z)
+            cases[int(c)].add_element_load(load)
+
+        model.load_cases = {load_case.name: load_case for load_case in cases}
+        model.load_combos = {
+            name: LoadCombination(name, {cases[c]: factor for c, factor in factors})
+            for name, factors in meta["load_combos"]
+        }
+
+    analysis = meta["analysis"]
+    if preprocess and analysis["preprocessed"]:
+        model.preprocess(
+            reorder = analysis["reorder"],
+            solver = analysis["solver"],
+            stability_check = analysis["stability_check"],
+            **analysis["cg_options"]
+        )
+    return model
@@ -0,0 +1,349 @@
+# src/model/io/text_import.py
+
+"""
+Streaming import of models from CSV or JSON-lines files.
+
+Every line is one record. CSV records start with the record kind followed
+by the fields in the order below. JSON-lines records are objects with a
+"kind" key and the fields by name. Fields in brackets are optional.
+Blank lines and CSV lines starting with # are skipped.
+
+    material        id, E, [G], [nu], [gamma]
+    section         id, area, [Ixx], [Iyy], [J]
+    node            id, x, y, [z]
+    restraint       node, UX, UY, UZ, RX, RY, RZ        (1 = restrained)
+    frame, beam     id, i, j, material, section, [roll] (radians)
+    truss           id, i, j, material, section
+    release         element, end, dof                   (end "i"/"j", dof 0-5)
+    nodal_load      case, node, FX, FY, FZ, MX, MY, MZ
+    udl             case, element, local, wx, wy, wz    (local 1/0)
+    point_load      case, element, a, local, px, py, pz
+    self_weight     case, element
+    combo           name, case, factor, case, factor, ...
+                    (JSON-lines: "name" and "factors": {case: factor})
+
+Records may appear in any order as long as objects are defined before
+they are referenced. IDs that are integers are read as integers (a column
+of IDs is converted as a whole), spaces after CSV separators are ignored.
+"""
+
+import csv
+import json
+from itertools import zip_longest
+import numpy as np
+from src.utils.exceptions import ModelDefinitionError
+from src.utils.helpers import paused_gc
+from src.model.model import Model
+from src.model.elements.frame import Frame
+from src.model.elements.beam import Beam
+from src.model.elements.truss import Truss
+from src.model.materials.base_material import Material
+from src.model.sections.base_section import Section
+from src.model.loads.load_case import LoadCase
+from src.model.loads.load_combo import LoadCombination
+from src.model.loads.element_load import UDL, SlfWgt, PntLd
+
+# Record kind -> (field names, number of required fields)
+RECORD_FIELDS = {
+    "material":    (["id", "E", "G", "nu", "gamma"], 2),
+    "section":     (["id", "area", "Ixx", "Iyy", "J"], 2),
+    "node":        (["id", "x", "y", "z"], 3),
+    "restraint":   (["node", "UX", "UY", "UZ", "RX", "RY", "RZ"], 1),
+    "frame":       (["id", "i", "j", "material", "section", "roll"], 5),
+    "beam":        (["id", "i", "j", "material", "section", "roll"], 5),
+    "truss":       (["id", "i", "j", "material", "section"], 5),
+    "release":     (["element", "end", "dof"], 3),
+    "nodal_load":  (["case", "node", "FX", "FY", "FZ", "MX", "MY", "MZ"], 2),
+    "udl":         (["case", "element", "local", "wx", "wy", "wz"], 3),
+    "point_load":  (["case", "element", "a", "local", "px", "py", "pz"], 4),
+    "self_weight": (["case", "element"], 2),
+    "combo":       (["name", "factors"], 1),
+}
+
+def _id(value):
+    # integer IDs are read as integers: digit strings and integral floats
+    # (JSON 7.0), other IDs (names, 1.5) are kept as they are
+    if isinstance(value, str):
+        return int(value) if value.lstrip("+-").isdigit() else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def _ids(values):
+    # _id of a column, all-integer string columns are converted at C speed
+    if all(type(value) is str for value in values):
+        try:
+            return list(map(int, values))
+        except ValueError:
+            pass
+    return [_id(value) for value in values]
+
+class RecordChunk:
+    """
+    Consecutive records of one kind, stored as rows of fields in the
+    order of RECORD_FIELDS (missing optional fields are "" or None).
+    Fields are converted a whole column at a time.
+    """
+    def __init__(self, kind, line_numbers, rows):
+        self.kind = kind
+        self.line_numbers = line_numbers
+        self.names = RECORD_FIELDS[kind][0]
+        # transposed once, rows with fewer fields are padded with None
+        self.columns = list(zip_longest(*rows))
+        self.size = len(rows)
+
+    def __len__(self):
+        return self.size
+
+    def values(self, name):
+        k = self.names.index(name)
+        return self.columns[k] if k < len(self.columns) else (None,) * self.size
+
+    def ids(self, name):
+        return _ids(self.values(name))
+
+    def text(self, name):
+        return [str(value) for value in self.values(name)]
+
+    def numbers(self, name, default=0.0):
+        column = np.array(self.values(name), dtype=object)
+        empty = (column == None) | (column == "")
+        column[empty] = default
+        try:
+            return column.astype(float)
+        except ValueError:
+            for k, value in enumerate(column):
+                try:
+                    float(value)
+                except (TypeError, ValueError):
+                    raise ModelDefinitionError(
+                        f"Line {self.line_numbers[k]}: {self.kind} {name} is not a number: {value}"
+                    ) from None
+
+    def check_required(self):
+        names, required = RECORD_FIELDS[self.kind]
+        for name in names[:required]:
+            column = np.array(self.values(name), dtype=object)
+            empty = (column == None) | (column == "")
+            if np.any(empty):
+                raise ModelDefinitionError(
+                    f"Line {self.line_numbers[np.argmax(empty)]}: {self.kind} record is missing {name}"
+                )
+
+def read_chunks(path, file_format=None, chunk_size=50_000):
+    """
+    Reads a CSV or JSON-lines file one line at a time and yields
+    RecordChunks of at most chunk_size consecutive records of one kind.\n
+    file_format: "csv" or "jsonl", default from the file extension.
+    """
+    if file_format is None:
+        file_format = "jsonl" if str(path).endswith((".jsonl", ".json")) else "csv"
+
+    kind, line_numbers, rows = None, [], []
+    with open(path, newline="") as f:
+        for line_number, (record_kind, row) in _records(f, file_format):
+            if record_kind not in RECORD_FIELDS:
+                raise ModelDefinitionError(f"Line {line_number}: unknown record kind {record_kind}")
+            if record_kind != kind or len(rows) >= chunk_size:
+                if rows:
+                    yield RecordChunk(kind, line_numbers, rows)
+                kind, line_numbers, rows = record_kind, [], []
+            line_numbers.append(line_number)
+            rows.append(row)
+    if rows:
+        yield RecordChunk(kind, line_numbers, rows)
+
+def _records(f, file_format):
+    # (line number, (kind, fields in RECORD_FIELDS order)) per record
+    if file_format == "jsonl":
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            kind = record.get("kind")
+            if kind == "combo":
+                yield line_number, (kind, [record.get("name"), record.get("factors", {})])
+            elif kind in RECORD_FIELDS:
+                yield line_number, (kind, [record.get(name) for name in RECORD_FIELDS[kind][0]])
+            else:
+                yield line_number, (kind, [])
+        return
+
+    for line_number, row in enumerate(csv.reader(f, skipinitialspace=True), 1):
+        if not row or not row[0] or row[0].startswith("#"):
+            continue
+        kind = row[0].lower()
+        if kind == "combo":
+            pairs = row[2:]
+            factors = {pairs[k]: float(pairs[k + 1]) for k in range(0, len(pairs) - 1, 2)}
+            yield line_number, (kind, [row[1] if len(row) > 1 else None, factors])
+        else:
+            yield line_number, (kind, row[1:])
+
+class ModelImporter:
+    """
+    Builds a Model from RecordChunks (see read_chunks). Every chunk is
+    converted column-wise and handed to the bulk constructors
+    (Model.add_nodes, add_frames, restrain_many, LoadCase.add_nodal_loads),
+    so no more than one chunk of parsed records is held at once.
+    """
+    def __init__(self):
+        self.model = Model()
+        self.node_rows = {}      # node id -> row in node insertion order
+        self.material_rows = {}  # material id -> row in model.material
+        self.section_rows = {}
+        self.cases = {}          # name -> LoadCase
+        self.combos = {}         # name -> LoadCombination
+
+    def add(self, chunk:RecordChunk):
+        chunk.check_required()
+        getattr(self, f"_add_{chunk.kind}")(chunk)
+
+    def finish(self):
+        self.model.load_cases = self.cases
+        self.model.load_combos = self.combos
+        return self.model
+
+    # --------------------------------
+    # LOOKUPS
+    # --------------------------------
+    def _lookup(self, objects, chunk, name, kind):
+        # objects[id] for every value of column name
+        ids = chunk.ids(name)
+        try:
+            return [objects[i] for i in ids]
+        except KeyError:
+            k = next(k for k, i in enumerate(ids) if i not in objects)
+            raise ModelDefinitionError(
+                f"Line {chunk.line_numbers[k]}: {kind} {ids[k]} is not defined"
+            ) from None
+
+    def _case(self, name):
+        if name not in self.cases:
+            self.cases[name] = LoadCase(name)
+        return self.cases[name]
+
+    # --------------------------------
+    # RECORDS
+    # --------------------------------
+    def _add_material(self, chunk):
+        G = chunk.numbers("G", np.nan)
+        for k, (material_id, E, nu, gamma) in enumerate(zip(
+            chunk.ids("id"), chunk.numbers("E"), chunk.numbers("nu"), chunk.numbers("gamma")
+        )):
+            if material_id in self.material_rows:
+                raise ModelDefinitionError(
+                    f"Line {chunk.line_numbers[k]}: duplicate material ID {material_id}"
+                )
+            self.material_rows[material_id] = len(self.model.material)
+            self.model.add_material(Material(
+                material_id, float(E), None if np.isnan(G[k]) else float(G[k]), float(nu), float(gamma)
+            ))
+
+    def _add_section(self, chunk):
+        for k, (section_id, area, Ixx, Iyy, J) in enumerate(zip(
+            chunk.ids("id"), chunk.numbers("area"), chunk.numbers("Ixx"),
+            chunk.numbers("Iyy"), chunk.numbers("J")
+        )):
+            if section_id in self.section_rows:
+                raise ModelDefinitionError(
+                    f"Line {chunk.line_numbers[k]}: duplicate section ID {section_id}"
+                )
+            self.section_rows[section_id] = len(self.model.section)
+            self.model.add_section(Section(section_id, float(area), float(Ixx), float(Iyy), float(J)))
+
+    def _add_node(self, chunk):
+        ids = chunk.ids("id")
+        xyz = np.column_stack([chunk.numbers("x"), chunk.numbers("y"), chunk.numbers("z")])
+        self.model.add_nodes(ids, xyz)
+        start = len(self.node_rows)
+        self.node_rows.update(zip(ids, range(start, start + len(ids))))
+
+    def _add_restraint(self, chunk):
+        dofs = RECORD_FIELDS["restraint"][0][1:]
+        self.model.restrain_many(
+            chunk.ids("node"),
+            np.column_stack([chunk.numbers(dof) != 0.0 for dof in dofs])
+        )
+
+    def _add_elements(self, chunk, element_type):
+        i_idx = np.array(self._lookup(self.node_rows, chunk, "i", "node"), dtype=int)
+        j_idx = np.array(self._lookup(self.node_rows, chunk, "j", "node"), dtype=int)
+        mat_idx = np.array(self._lookup(self.material_rows, chunk, "material", "material"), dtype=int)
+        sec_idx = np.array(self._lookup(self.section_rows, chunk, "section", "section"), dtype=int)
+        if element_type is Truss:
+            self.model.add_trusses(chunk.ids("id"), i_idx, j_idx, mat_idx, sec_idx)
+        else:
+            self.model.add_frames(
+                chunk.ids("id"), i_idx, j_idx, mat_idx, sec_idx,
+                chunk.numbers("roll"), element_type=element_type
+            )
+
+    def _add_frame(self, chunk):
+        self._add_elements(chunk, Frame)
+
+    def _add_beam(self, chunk):
+        self._add_elements(chunk, Beam)
+
+    def _add_truss(self, chunk):
+        self._add_elements(chunk, Truss)
+
+    def _add_release(self, chunk):
+        elements = self._lookup(self.model.element, chunk, "element", "element")
+        for element, end, dof in zip(elements, chunk.text("end"), chunk.numbers("dof").astype(int).tolist()):
+            element.release(end, dof)
+
+    def _add_nodal_load(self, chunk):
+        names = RECORD_FIELDS["nodal_load"][0][2:]
+        nodes = self._lookup(self.model.node, chunk, "node", "node")
+        loads = np.column_stack([chunk.numbers(name) for name in names])
+        cases = np.array(chunk.text("case"), dtype=object)
+        for case in dict.fromkeys(cases.tolist()):
+            rows = np.flatnonzero(cases == case)
+            self._case(case).add_nodal_loads([nodes[row] for row in rows.tolist()], loads[rows])
+
+    def _add_element_loads(self, chunk, make_load):
+        elements = self._lookup(self.model.element, chunk, "element", "element")
+        for case, load in zip(chunk.text("case"), make_load(elements)):
+            self._case(case).add_element_load(load)
+
+    def _add_udl(self, chunk):
+        local = chunk.numbers("local") != 0.0
+        wx, wy, wz = chunk.numbers("wx"), chunk.numbers("wy"), chunk.numbers("wz")
+        self._add_element_loads(chunk, lambda elements: (
+            UDL(element, bool(local[k]), float(wx[k]), float(wy[k]), float(wz[k]))
+            for k, element in enumerate(elements)
+        ))
+
+    def _add_point_load(self, chunk):
+        a, local = chunk.numbers("a"), chunk.numbers("local") != 0.0
+        px, py, pz = chunk.numbers("px"), chunk.numbers("py"), chunk.numbers("pz")
+        self._add_element_loads(chunk, lambda elements: (
+            PntLd(element, float(a[k]), bool(local[k]), float(px[k]), float(py[k]), float(pz[k]))
+            for k, element in enumerate(elements)
+        ))
+
+    def _add_self_weight(self, chunk):
+        self._add_element_loads(chunk, lambda elements: (SlfWgt(element) for element in elements))
+
+    def _add_combo(self, chunk):
+        for k, (name, factors) in enumerate(zip(chunk.text("name"), chunk.values("factors"))):
+            if name in self.combos:
+                raise ModelDefinitionError(
+                    f"Line {chunk.line_numbers[k]}: duplicate combination {name}"
+                )
+            self.combos[name] = LoadCombination(name, {
+                self._case(str(case)): float(factor) for case, factor in (factors or {}).items()
+            })
+
+def import_model(path, file_format=None, chunk_size=50_000):
+    """
+    Reads a model from a CSV or JSON-lines file (schema in the module
+    docstring) in chunks of chunk_size records. Load cases and
+    combinations are returned in model.load_cases and model.load_combos.
+    """
+    importer = ModelImporter()
+    with paused_gc():
+        for chunk in read_chunks(path, file_format, chunk_size):
+            importer.add(chunk)
+    return importer.finish()
@@ -21,24 +21,25 @@ class ElementLoad(ABC):
     # F_int(x) = F_NODE_i + ∑F_LOAD(x)
     # Applied Local End Forces is F_NODE_i
     # shear_y, moment_z, etc. are ∑F_LOAD(x)
+    # x may be a scalar or an array of stations
 
     # Local y 
     def shear_y(self, x, element):
-        return 0.0
+        return np.zeros(np.shape(x))
     def moment_z(self, x, element):
-        return 0.0
+        return np.zeros(np.shape(x))
 
     # Local z
     def shear_z(self, x, element):
-        return 0.0
+        return np.zeros(np.shape(x))
     def moment_y(self, x, element):
-        return 0.0
+        return np.zeros(np.shape(x))
 
     # Local x
     def axial(self, x, element):
-        return 0.0
+        return np.zeros(np.shape(x))
     def torsion(self, x, element):
-        return 0.0
+        return np.zeros(np.shape(x))
     
 class UniformlyDistributedLoad(ElementLoad):
     def __init__(self, local, wx=0.0, wy=0.0, wz=0.0):     
@@ -274,53 +275,24 @@ class PointLoad(ElementLoad):
 
         return fefs
     
+    # discontinuous at x = a, the load only acts for x > a
     # Local y
     def shear_y(self, x, element):
-        Vy = 0.0
-        # discontinuous at x = a
-        if x < self.a:
-            Vy = 0.0
-        if x > self.a:
-            Vy = self.py
-        return Vy
+        return np.where(np.greater(x, self.a), self.py, 0.0)
     
     def moment_z(self, x, element):
-        Mz = 0.0
-        # discontinuous at x = a
-        if x < self.a:
-            Mz = 0
-        if x > self.a:
-            Mz = self.py * (x-self.a)
-        return Mz
+        return np.where(np.greater(x, self.a), self.py * (np.subtract(x, self.a)), 0.0)
 
     # Local z    
     def shear_z(self, x, element):
-        Vz = 0.0
-        # discontinuous at x = a
-        if x < self.a:
-            Vz = 0.0
-        if x > self.a:
-            Vz = self.pz
-        return Vz
+        return np.where(np.greater(x, self.a), self.pz, 0.0)
     
     def moment_y(self, x, element):
-        My = 0.0
-        # discontinuous at x = a
-        if x < self.a:
-            My = 0
-        if x > self.a:
-            My = self.pz * (x-self.a)
-        return My
+        return np.where(np.greater(x, self.a), self.pz * (np.subtract(x, self.a)), 0.0)
     
     # Local x
     def axial(self, x, element):
-        Nx = 0.0
-        # discontinuous at x = a
-        if x < self.a:
-            Nx = 0.0
-        if x > self.a:
-            Nx = self.px
-        return Nx
+        return np.where(np.greater(x, self.a), self.px, 0.0)
 
 class PolynomialLoad(ElementLoad):
     # use integration to compute fef
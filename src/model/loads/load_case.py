@@ -1,22 +1,59 @@
 # src/model/loads/load_case.py
 
+import numpy as np
 from src.model.loads.nodal_load import NodalLoad
 from src.model.loads.element_load import ElementLoad
+from src.utils.helpers import paused_gc
 
 class LoadCase:
     def __init__(self, name: str):
         self.name = name
         self.nodalLoads = []     
         self.elementLoads = []   
+        self._version = 0  # bumped whenever loads are added (cached load case results)
+
+    def _register(self, node):
+        # nodes know the load cases loading them, so merging nodes can
+        # move the loads of cases that are not registered with the model
+        if node._load_cases is None:
+            node._load_cases = [self]
+        elif not any(load_case is self for load_case in node._load_cases):
+            node._load_cases.append(self)
 
     def add_nodal_load(self, load:NodalLoad):
         if not isinstance(load, NodalLoad):
             raise TypeError(f"{load} is not a Nodal Load")
         
         self.nodalLoads.append(load)
+        self._register(load.node)
+        self._version += 1
 
     def add_element_load(self, load:ElementLoad):
         if not isinstance(load, ElementLoad):
             raise TypeError(f"{load} is not an Element Load")
         
-        self.elementLoads.append(load)
\ No newline at end of file
+        self.elementLoads.append(load)
+        self._version += 1
+
+    def add_nodal_loads(self, nodes, loads):
+        """
+        Adds the nodal loads of many nodes at once.\n
+        nodes: n Node objects\n
+        loads: (n, 6) array FX, FY, FZ, MX, MY, MZ per node, zero entries
+        are skipped
+        """
+        loads = np.asarray(loads, dtype=float)
+        if loads.shape != (len(nodes), 6):
+            raise ValueError(f"Nodal loads must have shape ({len(nodes)}, 6), got {loads.shape}")
+        if not np.all(np.isfinite(loads)):
+            raise ValueError("Nodal loads must be finite")
+
+        rows, dofs = np.nonzero(loads)
+        with paused_gc():
+            self.nodalLoads.extend(
+                NodalLoad(nodes[row], dof, magnitude)
+                for row, dof, magnitude in zip(rows.tolist(), dofs.tolist(), loads[rows, dofs].tolist())
+            )
+        for row in np.unique(rows).tolist():
+            self._register(nodes[row])
+        self._version += 1
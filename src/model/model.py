@@ -8,14 +8,49 @@ class Model:
         self.element = {}
         self.material = {}
         self.section = {}
+        self.load_cases = {}     # name -> LoadCase, saved with the model
+        self.load_combos = {}    # name -> LoadCombination, saved with the model
+
+        # Structure-of-arrays snapshots for preprocessing, built by build_tables()
+        self.node_table = None
+        self.element_table = None
 
         self.ndof = 0  
         self.restrained_dofs = []
         self.free_dofs = []
+        self.free_mask = None        # (ndof,) True at free DOFs
+        self.restrained_mask = None  # (ndof,) True at restrained DOFs
+        self.free_position = None    # (ndof,) position in K_ff, -1 if restrained
+        self.node_index = {}     # node id -> row in stacked results
+        self.element_index = {}  # element id -> row in stacked results
+        self.node_dofs = None    # (n_nodes, 6) model-level DOF per node, -1 if absent
+        self.element_dofs = {}   # element type -> (rows, dofs, valid), see build_connectivity
+        self.element_matrices = {}  # element type -> (T, k_local) stacks, see assemble_stiffness
         self.K_full = None  
+        self.K_ff = None
+        self.K_ff_factor = None
+        self.bandwidth_report = {}  # numbering -> (half-bandwidth, profile) of K_ff
+        self.topology_report = {}   # connected components, orphan nodes, see validate_model
         self.F_full = None  
         self.D_full = None 
         self.reactions = None 
+        self.nodal_displacements = None  # (n_nodes, 6) last solve, per node row
+        self.nodal_reactions = None      # (n_nodes, 6) zero at free DOFs
+        self.element_end_forces_local = None   # (n_elements, 2, 6) last solve, per element row
+        self.element_end_forces_global = None
+        self.element_fef = None  # (n_elements, 12) local FEFs of the applied loads, stacked layout
+        self.load_case_results = {}  # LoadCase -> (version, unit factor results), superposition
+        self.pending_updates = set() # ids of elements with changed material/section
+
+        # Analysis options, set through preprocess()
+        self.reorder = None
+        self.solver = "sparse"
+        self.cg_options = {}     # preconditioner, tol, maxiter
+        self.stability_check = "pivots"
+
+        # Iterative solver log, one entry per solved right-hand side
+        self.cg_iterations = []
+        self.cg_residuals = []
 
         self._preprocessed = False
     
@@ -26,6 +61,8 @@ class Model:
                 f"Duplicate node ID detected: {node.id}"
             )
         self.node[node.id] = node
+        node._models.append(self)
+        self._invalidate()
     
     def add_element(self, element):
         if element.id in self.node:
@@ -33,23 +70,193 @@ class Model:
                 f"Duplicate element ID detected: {element.id}"
             )
         self.element[element.id] = element
+        element._models.append(self)
+        self._invalidate()
+
+    def _element_properties_changed(self, element):
+        # material/section of an element changed: written to the ElementTable,
+        # applied to an assembled model by update_elements() before the next solve
+        if self.element_table is not None:
+            row = self.element_table.index[element.id]
+            self.element_table.set_material(row, element.material)
+            self.element_table.set_section(row, element.section)
+        if self._preprocessed:
+            self.pending_updates.add(element.id)
+
+    def _invalidate(self):
+        # Called when nodes, elements, restraints or releases change.
+        # Drops the tables and the cached factorization, preprocess() has
+        # to be run again and rebuilds both from the node/element objects.
+        self._preprocessed = False
+        self.node_table = None
+        self.element_table = None
+        self.K_ff_factor = None
+        self.load_case_results = {}
+
+    def build_tables(self):
+        """
+        Builds the NodeTable/ElementTable arrays that preprocessing runs on.
+        Node coordinates become views of their rows. Any change of the
+        geometry, connectivity, restraints, releases or roll invalidates the
+        model and drops the tables, they are rebuilt on the next call (a node
+        may belong to several models, only the last table built is a view).
+        """
+        from src.model.geometry.tables import NodeTable, ElementTable
+        from src.utils.helpers import paused_gc
+        with paused_gc():
+            if self.node_table is None or self.element_table is None:
+                self.node_table = NodeTable(self.node.values())
+                self.element_table = ElementTable(self.element.values(), self.node_table)
+
+    def save(self, path, load_combos=None, load_cases=()):
+        """
+        Writes nodes, restraints, elements, releases, materials, sections,
+        load cases and combinations to a binary .npz file.\n
+        load_combos: default self.load_combos, their load cases are saved
+        with them. The analysis options are saved, the factorization is not.
+        """
+        from src.model.io.binary import save_model
+        save_model(self, path, load_combos, load_cases)
+
+    @staticmethod
+    def load(path, preprocess=True):
+        """
+        Reads a model written by Model.save(). Load cases and combinations
+        are in model.load_cases and model.load_combos.\n
+        preprocess=True: models saved after preprocess() are preprocessed
+        again with the saved options. The factorization is not saved, so
+        this reassembles and refactorizes K (and runs the stability check)
+        on every load, which dominates the load time of large models. Pass
+        preprocess=False to only read the model, e.g. to inspect or edit it.
+        """
+        from src.model.io.binary import load_model
+        return load_model(path, preprocess)
+
+    def add_material(self, material):
+        self.material[material.id] = material
+
+    def add_section(self, section):
+        self.section[section.id] = section
+
+    # Coordinate lookup
+    def find_nodes_near(self, point, radius):
+        """
+        IDs of the nodes within radius of point, nearest first (KD-tree
+        over the node coordinates). point may be (m, 3) for m queries,
+        one list per point is then returned.
+        """
+        from src.model.geometry.spatial import find_nodes_near as _find_nodes_near
+        return _find_nodes_near(self, point, radius)
+
+    def merge_coincident_nodes(self, tol=1e-6):
+        """
+        Merges nodes closer than tol (transitively) into the node of their
+        group that was added first and remaps element connectivity,
+        restraints and the nodal loads of every load case loading the
+        merged nodes (registered with the model or not).\n
+        Returns {removed node id: kept node id}.
+        """
+        from src.model.geometry.spatial import merge_coincident_nodes as _merge
+        return _merge(self, tol)
+
+    @staticmethod
+    def import_file(path, file_format=None, chunk_size=50_000):
+        """
+        Streams a model from a CSV or JSON-lines file into the bulk
+        constructors, chunk_size records at a time (schema: see
+        src/model/io/text_import.py). Load cases and combinations are in
+        model.load_cases and model.load_combos.
+        """
+        from src.model.io.text_import import import_model
+        return import_model(path, file_format, chunk_size)
+
+    # Bulk construction from arrays
+    def add_nodes(self, ids, xyz):
+        """
+        Adds nodes from an ID sequence and an (n, 3) coordinate array,
+        validated at once. Returns the new nodes.
+        """
+        from src.model.geometry.bulk import add_nodes as _add_nodes
+        return _add_nodes(self, ids, xyz)
 
-#   def add_material(self, material):
-#       self.material[material.id] = material
+    def add_frames(self, ids, i_idx, j_idx, mat_idx, sec_idx, roll=None,
+                   materials=None, sections=None, element_type=None):
+        """
+        Adds Frame (or element_type, e.g. Beam) elements from arrays.\n
+        i_idx, j_idx: end node rows in node insertion order\n
+        mat_idx, sec_idx: rows of materials/sections, default the ones
+        registered with add_material/add_section\n
+        Returns the new elements.
+        """
+        from src.model.geometry.bulk import add_elements
+        from src.model.elements.frame import Frame
+        return add_elements(
+            self, element_type or Frame, ids, i_idx, j_idx, mat_idx, sec_idx,
+            roll, materials, sections
+        )
 
-#   def add_section(self, section):
-#       self.section[section.id] = section
+    def add_trusses(self, ids, i_idx, j_idx, mat_idx, sec_idx, materials=None, sections=None):
+        """
+        Adds Truss elements from arrays, see add_frames.
+        """
+        from src.model.geometry.bulk import add_elements
+        from src.model.elements.truss import Truss
+        return add_elements(
+            self, Truss, ids, i_idx, j_idx, mat_idx, sec_idx,
+            None, materials, sections
+        )
+
+    def restrain_many(self, node_ids, dofs):
+        """
+        Restrains the DOFs dofs (list, or (n, 6) boolean mask) of the
+        nodes node_ids.
+        """
+        from src.model.geometry.bulk import restrain_many as _restrain_many
+        _restrain_many(self, node_ids, dofs)
 
-    def preprocess(self):
+    def preprocess(self, reorder=None, solver="sparse", 
+                   stability_check="pivots", **cg_options):
         """
         Validates model topology  
         Assigns DOFs    
         Assemble model stiffness    
         Checks stability
+        Factorizes K_ff
+
+        reorder: None (node insertion order) or "rcm" (Reverse Cuthill-McKee)\n
+        solver: "sparse" (SuperLU), "banded" (banded Cholesky) or
+        "cg" (preconditioned conjugate gradient)\n
+        stability_check: "pivots" (near-zero pivots of the factorization,
+        zero rows only for solver="cg"), "eigen" (also the smallest
+        eigenvalues of K_ff, factorizes once more) or None (zero rows only)\n
+        cg_options: preconditioner ("jacobi", "block_jacobi", "ichol"),
+        tol (relative residual), maxiter
         """
         from src.model.analysis.preprocessing import preprocess as _preprocess
+        self.reorder = reorder
+        self.solver = solver
+        self.stability_check = stability_check
+        self.cg_options = cg_options
         _preprocess(self)
     
+    def update_elements(self, element_ids=None, max_rank=200):
+        """
+        Incremental re-analysis after material/section changes of the
+        elements element_ids (default: every changed element).\n
+        The stiffness deltas are applied as a low-rank update of the
+        existing factorization, K_ff is only refactorized once the
+        accumulated rank exceeds max_rank.
+        Solves apply pending updates automatically.
+        """
+        from src.model.analysis.preprocessing import update_elements as _update_elements
+        if not self._preprocessed:
+            raise RuntimeError(
+                "Model.preprocess() was not called before update_elements()"
+            )
+        if element_ids is None:
+            element_ids = list(self.pending_updates)
+        _update_elements(self, element_ids, max_rank)
+    
     def apply_loads_in_load_combo(self, load_combo):
         # reset all nodes and elements between each load combo application
         for node in self.node.values():
@@ -68,7 +275,65 @@ class Model:
                 elementLoad.apply(loadFactor)
 
     def linear_static_solve(self, load_combo):
-        from src.model.analysis.linear_static import solve as _solve
+        """
+        Solves one load combination. Results are written to the nodes and
+        elements and returned as a ResultSet, which keeps them after the
+        next solve.
+        """
+        from src.model.analysis.linear_static import solve as _solve, last_results
 
         self.apply_loads_in_load_combo(load_combo) 
-        _solve(self)
\ No newline at end of file
+        _solve(self)
+        return last_results(self, load_combo.name)
+
+    def internal_forces(self, stations=11):
+        """
+        Internal forces Nx, Vy, Vz, Tx, My, Mz of every element for the
+        last solved load combination, (n_elements, n_stations, 6).\n
+        stations: number of equally spaced stations or relative positions
+        along the members (0 = node i, 1 = node j)
+        """
+        from src.model.analysis.internal_forces import internal_forces as _internal_forces
+        return _internal_forces(self, stations)
+
+    def internal_force_extrema(self):
+        """
+        Exact max/min of Nx, Vy, Vz, Tx, My, Mz along every element for the
+        last solved load combination, from the piecewise polynomial internal
+        force functions (no station sampling).\n
+        Returns (max, x_max, min, x_min), each (n_elements, 6).
+        """
+        from src.model.analysis.internal_forces import internal_force_extrema as _extrema
+        return _extrema(self)
+
+    def force_envelope(self, load_combos, stations=11, superposition=False):
+        """
+        Max/min internal forces of every element station over the load
+        combinations and the governing combination (Envelope).\n
+        End forces are solved for all combinations in one batch, internal
+        forces are streamed, only the running max/min arrays are kept.
+        superposition=True solves each load case once and forms the
+        combinations as factor-weighted sums.
+        """
+        from src.model.analysis.internal_forces import force_envelope as _force_envelope
+        return _force_envelope(self, load_combos, stations, superposition)
+
+    def solve_all(self, load_combos, superposition=False, store=None):
+        """
+        Solves every load combination in a single factorized call.\n
+        superposition=True solves each load case once and forms the
+        combinations as factor-weighted sums.\n
+        Returns a ResultSet with displacements, reactions and element
+        end forces stacked per combination.\n
+        store: ResultStore (or a directory for a new one), combinations are
+        then solved in batches of the store chunk size and written to disk,
+        the store is returned.
+        """
+        from src.model.analysis.linear_static import solve_all as _solve_all, solve_to_store
+        if store is None:
+            return _solve_all(self, load_combos, superposition)
+
+        from src.model.results.result_store import ResultStore
+        if not isinstance(store, ResultStore):
+            store = ResultStore.create(store, self.node_index, self.element_index)
+        return solve_to_store(self, load_combos, store, superposition)
@@ -0,0 +1,54 @@
+# src/model/results/envelope.py
+
+import numpy as np
+
+class Envelope:
+    """
+    Running max/min of the member internal forces over load combinations.\n
+    max[e, s, f], min[e, s, f]      e = element row, s = station,
+                                    f = Nx, Vy, Vz, Tx, My, Mz
+    max_combo, min_combo            governing combination, index into combo_names
+    x[e, s]                         station distances from node i
+
+    Only the running arrays are kept, so the memory footprint does not
+    depend on the number of combinations.
+    """
+    def __init__(self, element_index, x):
+        self.element_index = element_index
+        self.x = x
+        self.combo_names = []
+
+        shape = (*x.shape, 6)
+        self.max = np.full(shape, -np.inf)
+        self.min = np.full(shape, np.inf)
+        self.max_combo = np.full(shape, -1, dtype=int)
+        self.min_combo = np.full(shape, -1, dtype=int)
+
+    def add(self, combo_name, forces):
+        """
+        Folds the internal forces (n_elements, n_stations, 6) of one
+        combination into the envelope.
+        """
+        c = len(self.combo_names)
+        self.combo_names.append(combo_name)
+
+        larger = forces > self.max
+        self.max[larger] = forces[larger]
+        self.max_combo[larger] = c
+
+        smaller = forces < self.min
+        self.min[smaller] = forces[smaller]
+        self.min_combo[smaller] = c
+
+    def governing(self, element_id, force:int, maximum:bool=True):
+        """
+        Returns (value, station distance, combination name) of the largest
+        (maximum=True) or smallest internal force of an element.\n
+        force: 0 = Nx, 1 = Vy, 2 = Vz, 3 = Tx, 4 = My, 5 = Mz
+        """
+        e = self.element_index[element_id]
+        values = self.max[e, :, force] if maximum else self.min[e, :, force]
+        combos = self.max_combo[e, :, force] if maximum else self.min_combo[e, :, force]
+
+        s = np.argmax(values) if maximum else np.argmin(values)
+        return float(values[s]), float(self.x[e, s]), self.combo_names[combos[s]]
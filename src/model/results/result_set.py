@@ -0,0 +1,168 @@
+# src/model/results/result_set.py
+
+import numpy as np
+from src.utils.helpers import DOF_NAMES, GLOBAL_REACTION_NAMES, LOCAL_REACTION_NAMES
+
+class ResultSet:
+    """
+    Stacked analysis results for a list of load combinations.\n
+    displacements[c, n, dof]            c = combination, n = node row
+    reactions[c, n, dof]                zero at free DOFs
+    end_forces_local[c, e, end, dof]    e = element row, end 0 = i, 1 = j
+    end_forces_global[c, e, end, dof]
+
+    Node and element rows follow model.node_index and model.element_index.
+    DOFs that an element or node does not have are stored as 0.0\n
+    The arrays are not shared with the model, a ResultSet stays valid
+    after later solves. Queries return views of the arrays.
+    """
+    def __init__(self, combo_names, node_index, element_index,
+                 displacements, reactions,
+                 end_forces_local, end_forces_global):
+        self.combo_names = list(combo_names)
+        self.combo_index = {name: c for c, name in enumerate(self.combo_names)}
+        self.node_index = node_index
+        self.element_index = element_index
+
+        self.displacements = displacements
+        self.reactions = reactions
+        self.end_forces_local = end_forces_local
+        self.end_forces_global = end_forces_global
+
+    def __len__(self):
+        return len(self.combo_names)
+
+    @classmethod
+    def stack(cls, result_sets):
+        """
+        Concatenates the combinations of several ResultSets of the same
+        model (same node and element rows) into one ResultSet.
+        """
+        result_sets = list(result_sets)
+        first = result_sets[0]
+        for result_set in result_sets[1:]:
+            if (result_set.node_index != first.node_index
+                    or result_set.element_index != first.element_index):
+                raise ValueError("ResultSets of different node/element numbering cannot be stacked.")
+
+        return cls(
+            combo_names = [name for r in result_sets for name in r.combo_names],
+            node_index = first.node_index,
+            element_index = first.element_index,
+            displacements = np.concatenate([r.displacements for r in result_sets]),
+            reactions = np.concatenate([r.reactions for r in result_sets]),
+            end_forces_local = np.concatenate([r.end_forces_local for r in result_sets]),
+            end_forces_global = np.concatenate([r.end_forces_global for r in result_sets])
+        )
+
+    # --------------------------------
+    # INDEXING
+    # --------------------------------
+    def _combos(self, combo):
+        # None = all combinations, a name, or a list of names
+        if combo is None:
+            return slice(None)
+        if isinstance(combo, (list, tuple)):
+            return [self.combo_index[name] for name in combo]
+        return self.combo_index[combo]
+
+    @staticmethod
+    def _rows(index, ids):
+        # None = all rows, an id, or a list of ids
+        if ids is None:
+            return slice(None)
+        if isinstance(ids, (list, tuple, np.ndarray)):
+            return [index[i] for i in ids]
+        return index[ids]
+
+    @staticmethod
+    def _dofs(dof, names):
+        # None = all DOFs, an index 0-5, a name (e.g. "UX", "Mz") or a list
+        if dof is None:
+            return slice(None)
+        if isinstance(dof, (list, tuple)):
+            return [ResultSet._dofs(d, names) for d in dof]
+        if isinstance(dof, str):
+            lookup = {name.upper(): i for i, name in names.items()}
+            return lookup[dof.upper()]
+        return dof
+
+    # --------------------------------
+    # QUERYING API
+    # --------------------------------
+    def select(self, combos):
+        """
+        ResultSet with the combinations combos only (list of names).
+        """
+        c = self._combos(list(combos))
+        return ResultSet(
+            combo_names = [self.combo_names[k] for k in c],
+            node_index = self.node_index,
+            element_index = self.element_index,
+            displacements = self.displacements[c],
+            reactions = self.reactions[c],
+            end_forces_local = self.end_forces_local[c],
+            end_forces_global = self.end_forces_global[c]
+        )
+
+    def displacement(self, node_id=None, dof=None, combo=None):
+        """
+        Nodal displacements indexed by node ID(s), DOF (0-5 or "UX", ...,
+        "RZ") and combination name(s). None selects everything along that
+        axis, a single value drops the axis:
+            displacement(7, "UZ")           -> (ncombos,)
+            displacement(combo="ULS1")      -> (n_nodes, 6)
+        """
+        c = self._combos(combo)
+        n = self._rows(self.node_index, node_id)
+        d = self._dofs(dof, DOF_NAMES)
+        return self._take(self.displacements, c, n, d)
+
+    def reaction(self, node_id=None, dof=None, combo=None):
+        """
+        Nodal reactions, same indexing as displacement() with DOF names
+        "FX", ..., "MZ".
+        """
+        c = self._combos(combo)
+        n = self._rows(self.node_index, node_id)
+        d = self._dofs(dof, GLOBAL_REACTION_NAMES)
+        return self._take(self.reactions, c, n, d)
+
+    def end_force(self, element_id=None, end=None, dof=None, combo=None, local=True):
+        """
+        Element end forces indexed by element ID(s), end (0 or "i", 1 or "j"),
+        DOF (0-5, local "Nx", ..., "Mz" or global "FX", ..., "MZ") and
+        combination name(s):
+            end_force(element_id=[1, 2, 3], end="j", dof="Mz")  -> (ncombos, 3)
+        """
+        forces = self.end_forces_local if local else self.end_forces_global
+        c = self._combos(combo)
+        e = self._rows(self.element_index, element_id)
+        end = {"i": 0, "j": 1}.get(end, end)
+        end = slice(None) if end is None else end
+        d = self._dofs(dof, LOCAL_REACTION_NAMES if local else GLOBAL_REACTION_NAMES)
+        return self._take(forces, c, e, end, d)
+
+    @staticmethod
+    def _take(array, *index):
+        # at most one list index per call keeps numpy from broadcasting lists
+        # against each other, the others are applied one axis at a time
+        result = array
+        axis = 0
+        for i in index:
+            if isinstance(i, list):
+                result = np.take(result, i, axis=axis)
+                axis += 1
+            else:
+                result = result[(slice(None),) * axis + (i,)]
+                if isinstance(i, slice):
+                    axis += 1
+        return result
+
+    def governing(self, values, maximum=True):
+        """
+        Name of the combination with the largest (maximum=True) or
+        smallest value in a (ncombos,) query result, and the value.
+        """
+        c = np.argmax(values) if maximum else np.argmin(values)
+        return self.combo_names[c], float(values[c])
@@ -0,0 +1,208 @@
+# src/model/results/result_store.py
+
+import json
+import os
+import numpy as np
+from src.model.results.result_set import ResultSet
+
+# Arrays of a ResultSet, shape of one combination given n_nodes, n_elements
+STORED_ARRAYS = {
+    "displacements":     lambda n, e: (n, 6),
+    "reactions":         lambda n, e: (n, 6),
+    "end_forces_local":  lambda n, e: (e, 2, 6),
+    "end_forces_global": lambda n, e: (e, 2, 6),
+}
+
+class ResultStore:
+    """
+    On-disk results of any number of load combinations, same layout and
+    queries as ResultSet.\n
+    path/index.json         node IDs, element IDs, combination names, chunk size
+    path/<array>_<k>.npy    combinations k*chunk_size ... (k+1)*chunk_size - 1
+                            of every array in STORED_ARRAYS
+
+    Chunks are memory-mapped .npy files: append() writes a ResultSet into
+    the open chunk, queries only read the rows they select, so the store
+    may be much larger than the available memory.
+    Node/element IDs and combination names must be JSON serializable.
+    """
+    def __init__(self, path, node_ids, element_ids, combo_names=(), chunk_size=100, mode="r"):
+        self.path = path
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.node_index = {node_id: n for n, node_id in enumerate(node_ids)}
+        self.element_index = {element_id: e for e, element_id in enumerate(element_ids)}
+        self.combo_names = list(combo_names)
+        self.combo_index = {name: c for c, name in enumerate(self.combo_names)}
+        self._chunks = {}   # chunk number -> {array name: memmap}
+
+    def __len__(self):
+        return len(self.combo_names)
+
+    @classmethod
+    def create(cls, path, node_index, element_index, chunk_size=100):
+        """
+        New empty store at path (a directory) for the node and element rows
+        of a model (model.node_index, model.element_index).
+        """
+        os.makedirs(path, exist_ok=True)
+        store = cls(path, list(node_index), list(element_index), chunk_size=chunk_size, mode="w")
+        store.flush()
+        return store
+
+    @classmethod
+    def open(cls, path):
+        """
+        Opens an existing store for reading.
+        """
+        with open(os.path.join(path, "index.json")) as f:
+            index = json.load(f)
+        return cls(
+            path, index["node_ids"], index["element_ids"],
+            index["combo_names"], index["chunk_size"], mode="r"
+        )
+
+    def flush(self):
+        """
+        Writes the index and the open chunks to disk.
+        """
+        for arrays in self._chunks.values():
+            for array in arrays.values():
+                if array.mode != "r":
+                    array.flush()
+
+        index = {
+            "node_ids": list(self.node_index),
+            "element_ids": list(self.element_index),
+            "combo_names": self.combo_names,
+            "chunk_size": self.chunk_size,
+        }
+        with open(os.path.join(self.path, "index.json"), "w") as f:
+            json.dump(index, f)
+
+    def close(self):
+        self.flush()
+        self._chunks = {}
+
+    # --------------------------------
+    # WRITING
+    # --------------------------------
+    def _chunk(self, k, create=False):
+        # memmaps of chunk k, created with chunk_size combinations if needed
+        if k not in self._chunks:
+            n, e = len(self.node_index), len(self.element_index)
+            arrays = {}
+            for name, shape in STORED_ARRAYS.items():
+                file = os.path.join(self.path, f"{name}_{k:05d}.npy")
+                if create:
+                    arrays[name] = np.lib.format.open_memmap(
+                        file, mode="w+", shape=(self.chunk_size, *shape(n, e))
+                    )
+                else:
+                    arrays[name] = np.load(file, mmap_mode="r" if self.mode == "r" else "r+")
+            self._chunks[k] = arrays
+        return self._chunks[k]
+
+    def append(self, result_set:ResultSet):
+        """
+        Appends the combinations of a ResultSet of the same model.
+        """
+        if self.mode == "r":
+            raise ValueError(f"Result store {self.path} is opened read-only.")
+        if (list(result_set.node_index) != list(self.node_index)
+                or list(result_set.element_index) != list(self.element_index)):
+            raise ValueError("ResultSet node/element numbering does not match the store.")
+        for name in result_set.combo_names:
+            if name in self.combo_index:
+                raise ValueError(f"Combination {name} is already stored.")
+
+        done = 0
+        while done < len(result_set):
+            c = len(self.combo_names)
+            k, offset = divmod(c, self.chunk_size)
+            if offset == 0:
+                # only the open chunk is kept mapped while writing
+                self.flush()
+                self._chunks = {}
+            arrays = self._chunk(k, create=(offset == 0))
+
+            count = min(self.chunk_size - offset, len(result_set) - done)
+            for name in STORED_ARRAYS:
+                arrays[name][offset:offset + count] = getattr(result_set, name)[done:done + count]
+
+            for name in result_set.combo_names[done:done + count]:
+                self.combo_index[name] = len(self.combo_names)
+                self.combo_names.append(name)
+            done += count
+
+    # --------------------------------
+    # QUERYING API
+    # --------------------------------
+    def _query(self, method, combo, **query):
+        # runs a ResultSet query on every memory-mapped chunk holding
+        # selected combinations and stacks the results
+        if combo is not None and not isinstance(combo, (list, tuple)):
+            k = self.combo_index[combo] // self.chunk_size
+            return getattr(self._chunk_results(k), method)(combo=combo, **query)
+
+        combo = self.combo_names if combo is None else list(combo)
+        groups = {}     # chunk -> positions in combo
+        for i, name in enumerate(combo):
+            groups.setdefault(self.combo_index[name] // self.chunk_size, []).append(i)
+
+        parts, order = [], []
+        for k, members in groups.items():
+            parts.append(getattr(self._chunk_results(k), method)(
+                combo=[combo[i] for i in members], **query
+            ))
+            order.extend(members)
+        if not parts:
+            raise ValueError(f"Result store {self.path} holds no combinations.")
+        return np.concatenate(parts)[np.argsort(order)]
+
+    def _chunk_results(self, k):
+        # ResultSet view of the stored combinations of chunk k
+        count = min(self.chunk_size, len(self.combo_names) - k * self.chunk_size)
+        arrays = self._chunk(k)
+        return ResultSet(
+            combo_names = self.combo_names[k * self.chunk_size:k * self.chunk_size + count],
+            node_index = self.node_index,
+            element_index = self.element_index,
+            **{name: arrays[name][:count] for name in STORED_ARRAYS}
+        )
+
+    def results(self, combos):
+        """
+        In-memory ResultSet of the combinations combos (list of names).
+        """
+        combos = list(combos)
+        return ResultSet(
+            combo_names = combos,
+            node_index = self.node_index,
+            element_index = self.element_index,
+            **{name: np.stack([
+                self._chunk(self.combo_index[c] // self.chunk_size)[name][
+                    self.combo_index[c] % self.chunk_size
+                ] for c in combos
+            ]) for name in STORED_ARRAYS}
+        )
+
+    def displacement(self, node_id=None, dof=None, combo=None):
+        """
+        Same as ResultSet.displacement, reads only the selected combinations.
+        """
+        return self._query("displacement", combo, node_id=node_id, dof=dof)
+
+    def reaction(self, node_id=None, dof=None, combo=None):
+        """
+        Same as ResultSet.reaction, reads only the selected combinations.
+        """
+        return self._query("reaction", combo, node_id=node_id, dof=dof)
+
+    def end_force(self, element_id=None, end=None, dof=None, combo=None, local=True):
+        """
+        Same as ResultSet.end_force, e.g. Mz at end j of 500 elements over
+        all combinations:
+            store.end_force(element_ids, "j", "Mz")  -> (ncombos, 500)
+        """
+        return self._query("end_force", combo, element_id=element_id, end=end, dof=dof, local=local)
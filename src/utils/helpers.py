@@ -1,5 +1,8 @@
 # src/utils/dof_helper.py
 
+import gc
+from contextlib import contextmanager
+
 DOF_NAMES = {
     0: "UX", 1: "UY", 2: "UZ",
     3: "RX", 4: "RY", 5: "RZ"
@@ -38,4 +41,31 @@ def local_dof_map(element):
         for dof in element.NODE_DOF_INDICES:     # 0 = ux, 1 = uy, ..., 5 = rz
             dof_map[(node, dof)] = idx
             idx += 1
-    return dof_map
\ No newline at end of file
+    return dof_map
+
+def stacked_dof_positions(element):
+    """
+    Converts local fef vector indexing to the flattened (node, dof) layout
+    of the stacked results, where every node end has all 6 DOFs.\n
+    For example, a Beam element with 8 DOFs:\n
+        Local fef vector indexing:  0 = uy_i, 1 = uz_i, 2 = ry_i, 3 = rz_i, 
+                                    4 = uy_j, 5 = uz_j, 6 = ry_j, 7 = rz_j
+
+        Thus:   stacked_dof_positions(beam) returns [1, 2, 4, 5, 7, 8, 10, 11]
+    """
+    return [node*6 + dof for node in (0, 1) for dof in element.NODE_DOF_INDICES]
+
+@contextmanager
+def paused_gc():
+    """
+    Pauses the cyclic garbage collector while many objects are created
+    at once (bulk model construction). Every allocation burst would
+    otherwise trigger collections that rescan all objects created so far.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
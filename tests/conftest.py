@@ -0,0 +1,111 @@
+# tests/conftest.py
+
+import math
+import random
+import numpy as np
+import pytest
+
+from src.model.geometry.node import Node
+from src.model.elements.frame import Frame
+from src.model.elements.truss import Truss
+from src.model.materials.base_material import Material
+from src.model.sections.base_section import Section
+from src.model.model import Model
+from src.model.loads.load_combo import LoadCombination
+from src.model.loads.load_case import LoadCase
+from src.model.loads.nodal_load import NodalLoad
+from src.model.loads.element_load import UDL, SlfWgt, PntLd
+from src.utils import global_variables as gv
+
+
+def build_frame(nx=2, nz=1, ny=2, seed=0):
+    """
+    Space frame of nx x nz bays and ny storeys, fixed at the base, with
+    rolled columns, released beam ends, truss bracing and three load cases
+    (self weight, beam UDLs and point loads, nodal wind loads).
+    Nodes are added in random order. Returns (model, load_combos).
+    """
+    rnd = random.Random(seed)
+    mat = Material("S", E=200000, nu=0.3, gamma=7.85e-5)
+    column = Section("C", area=5000, Ixx=8e7, Iyy=3e7, J=1e6)
+    beam = Section("B", area=3000, Ixx=5e7, Iyy=1e7, J=4e5)
+    brace = Section("T", area=800)
+
+    grid = [(i, k, j) for j in range(ny + 1) for i in range(nx + 1) for k in range(nz + 1)]
+    rnd.shuffle(grid)
+    nodes = {}
+    for node_id, (i, k, j) in enumerate(grid, 1):
+        node = Node(node_id, 5000.0*i, 3500.0*j, -4000.0*k)
+        if j == 0:
+            for dof in gv.GLOBAL_DISP_DOFS:
+                node.restrain(dof)
+        nodes[(i, k, j)] = node
+
+    elements = []
+    for j in range(ny):
+        for i in range(nx + 1):
+            for k in range(nz + 1):
+                elements.append(Frame(
+                    f"C{len(elements)}", nodes[(i, k, j)], nodes[(i, k, j + 1)], mat, column,
+                    roll_radians=rnd.choice([0.0, math.pi/2, 0.3])
+                ))
+    for j in range(1, ny + 1):
+        for (di, dk) in ((1, 0), (0, 1)):
+            for i in range(nx + 1 - di):
+                for k in range(nz + 1 - dk):
+                    element = Frame(
+                        f"B{len(elements)}", nodes[(i, k, j)], nodes[(i + di, k + dk, j)], mat, beam
+                    )
+                    if rnd.random() < 0.4:
+                        element.release("i", gv.RY)
+                        element.release("i", gv.RZ)
+                    elements.append(element)
+    for j in range(ny):
+        elements.append(Truss(f"T{len(elements)}", nodes[(0, 0, j)], nodes[(1, 0, j + 1)], mat, brace))
+
+    model = Model()
+    for node in nodes.values():
+        model.add_node(node)
+    for element in elements:
+        model.add_element(element)
+
+    DL, LL, WL = LoadCase("DL"), LoadCase("LL"), LoadCase("WL")
+    for element in elements:
+        if isinstance(element, Truss):
+            continue
+        DL.add_element_load(SlfWgt(element))
+        if element.id.startswith("B"):
+            LL.add_element_load(UDL(element, rnd.random() < 0.5, 0.0, -rnd.uniform(1, 5), rnd.uniform(-1, 1)))
+            LL.add_element_load(PntLd(element, rnd.uniform(500, 3500), rnd.random() < 0.5, 0.0, -rnd.uniform(1e3, 1e4)))
+    for (i, k, j), node in nodes.items():
+        if j > 0 and i == 0:
+            WL.add_nodal_load(NodalLoad(node, gv.FX, 1e4*j))
+            WL.add_nodal_load(NodalLoad(node, gv.MY, 1e5))
+
+    load_combos = [
+        LoadCombination("ULS1", {DL: 1.4}),
+        LoadCombination("ULS2", {DL: 1.2, LL: 1.6}),
+        LoadCombination("ULS3", {DL: 1.2, LL: 0.5, WL: 1.5}),
+        LoadCombination("SLS", {DL: 1.0, LL: 1.0, WL: -0.7}),
+    ]
+    return model, load_combos
+
+def sequential_results(model, load_combos):
+    """
+    Baseline: one linear_static_solve per combination, stacked.
+    Returns (displacements, reactions, end_forces_local).
+    """
+    results = [model.linear_static_solve(load_combo) for load_combo in load_combos]
+    return tuple(
+        np.concatenate([getattr(result, name) for result in results])
+        for name in ("displacements", "reactions", "end_forces_local")
+    )
+
+def assert_close(actual, expected, rtol=1e-9):
+    # relative to the largest entry, small entries are roundoff
+    scale = max(np.abs(expected).max(), 1e-30)
+    assert np.abs(actual - expected).max() <= rtol * scale
+
+@pytest.fixture
+def frame():
+    return build_frame()
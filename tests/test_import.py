@@ -0,0 +1,70 @@
+# tests/test_import.py
+
+import json
+
+from src.model.model import Model
+from src.model.loads.load_combo import LoadCombination
+
+from tests.conftest import build_frame, sequential_results, assert_close
+
+
+def write_csv(model, load_combos, path):
+    """The frame of build_frame as CSV records (node loads only)."""
+    lines = []
+    for material in {id(e.material): e.material for e in model.element.values()}.values():
+        lines.append(f"material,{material.id},{material.E},,{material.nu},{material.gamma}")
+    for section in {id(e.section): e.section for e in model.element.values()}.values():
+        lines.append(f"section,{section.id},{section.area},{section.Ixx},{section.Iyy},{section.J}")
+    for node in model.node.values():
+        lines.append(f"node,{node.id},{node.x},{node.y},{node.z}")
+        if any(node.restraints.values()):
+            flags = ",".join(str(int(node.restraints[dof])) for dof in range(6))
+            lines.append(f"restraint,{node.id},{flags}")
+    for element in model.element.values():
+        kind = type(element).__name__.lower()
+        row = f"{kind},{element.id},{element.i.id},{element.j.id},{element.material.id},{element.section.id}"
+        lines.append(row + ("" if kind == "truss" else f",{element.roll!r}"))
+        for end in ("i", "j"):
+            for dof in sorted(getattr(element, "releases", {end: ()})[end]):
+                lines.append(f"release,{element.id},{end},{dof % 6}")
+    for load_combo in load_combos:
+        for load_case in load_combo.loadCaseAndFactors:
+            for load in load_case.nodalLoads:
+                values = [0.0] * 6
+                values[load.dof] = load.magnitude
+                lines.append(f"nodal_load,{load_case.name},{load.node.id}," + ",".join(map(str, values)))
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_csv_import_matches_model(tmp_path):
+    model, load_combos = build_frame(seed=3)
+    wind = [LoadCombination("W", {lc: 1.0}) for lc in load_combos[2].loadCaseAndFactors if lc.name == "WL"]
+    write_csv(model, wind, tmp_path / "model.csv")
+    model.preprocess()
+    expected = sequential_results(model, wind)
+
+    imported = Model.import_file(tmp_path / "model.csv")
+    imported.preprocess()
+    combo = LoadCombination("W", {imported.load_cases["WL"]: 1.0})
+    for actual, baseline in zip(sequential_results(imported, [combo]), expected):
+        assert_close(actual, baseline)
+
+
+def test_json_ids(tmp_path):
+    records = [
+        {"kind": "material", "id": "S", "E": 200000, "nu": 0.3},
+        {"kind": "section", "id": "C", "area": 5000, "Ixx": 8e7, "Iyy": 3e7, "J": 1e6},
+        {"kind": "node", "id": 1.0, "x": 0, "y": 0},
+        {"kind": "node", "id": 1.5, "x": 0, "y": 3000},
+        {"kind": "node", "id": "A", "x": 4000, "y": 3000},
+        {"kind": "frame", "id": 10.0, "i": 1, "j": 1.5, "material": "S", "section": "C"},
+        {"kind": "frame", "id": "F2", "i": 1.5, "j": "A", "material": "S", "section": "C"},
+    ]
+    path = tmp_path / "model.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+    model = Model.import_file(path)
+    assert list(model.node) == [1, 1.5, "A"]
+    assert type(list(model.node)[0]) is int
+    assert list(model.element) == [10, "F2"]
+    assert model.element[10].j is model.node[1.5]
@@ -0,0 +1,41 @@
+# tests/test_internal_forces.py
+
+import numpy as np
+import pytest
+
+from tests.conftest import assert_close
+
+
+@pytest.mark.parametrize("superposition", [False, True])
+def test_force_envelope_matches_sequential(frame, superposition):
+    model, load_combos = frame
+    model.preprocess()
+    forces = []
+    for load_combo in load_combos:
+        model.linear_static_solve(load_combo)
+        forces.append(model.internal_forces(7))
+    forces = np.array(forces)
+
+    envelope = model.force_envelope(load_combos, 7, superposition=superposition)
+    assert_close(envelope.max, forces.max(axis=0))
+    assert_close(envelope.min, forces.min(axis=0))
+
+
+def test_moments_in_equilibrium_at_node_j(frame):
+    # the internal moments reach the node j end forces, Mz_internal = Mz_j
+    # and My_internal = -My_j at x = L, with element loads on the beams
+    model, load_combos = frame
+    model.preprocess()
+    model.linear_static_solve(load_combos[1])
+
+    end_forces = model.element_end_forces_local
+    at_j = model.internal_forces([1.0])[:, 0]
+    assert_close(at_j[:, 5], end_forces[:, 1, 5])
+    assert_close(at_j[:, 4], -end_forces[:, 1, 4])
+
+    loaded = [element for element in model.element.values() if element.loads]
+    assert loaded
+    for element in loaded:
+        L = element.length()
+        assert_close(element.Mz_internal(L), element.Mz_j)
+        assert_close(element.My_internal(L), -element.My_j)
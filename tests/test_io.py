@@ -0,0 +1,74 @@
+# tests/test_io.py
+
+import numpy as np
+
+from src.model.model import Model
+from src.model.materials.base_material import Material
+from src.model.sections.base_section import Section
+from src.model.loads.load_case import LoadCase
+from src.model.loads.load_combo import LoadCombination
+from src.model.loads.nodal_load import NodalLoad
+from src.model.results.result_store import ResultStore
+from src.utils import global_variables as gv
+
+from tests.conftest import build_frame, sequential_results, assert_close
+
+
+def test_save_load_round_trip(tmp_path):
+    model, load_combos = build_frame(seed=2)
+    model.preprocess()
+    expected = sequential_results(model, load_combos)
+    model.save(tmp_path / "model.npz", load_combos)
+
+    loaded = Model.load(tmp_path / "model.npz")
+    assert list(loaded.node) == list(model.node)
+    assert list(loaded.element) == list(model.element)
+    combos = [loaded.load_combos[load_combo.name] for load_combo in load_combos]
+    for actual, baseline in zip(sequential_results(loaded, combos), expected):
+        assert_close(actual, baseline)
+
+
+def numpy_id_model():
+    """Cantilever frame added in bulk with numpy integer IDs."""
+    model = Model()
+    model.add_material(Material("S", E=200000, nu=0.3))
+    model.add_section(Section("C", area=5000, Ixx=8e7, Iyy=3e7, J=1e6))
+    node_ids = np.arange(1, 4)
+    model.add_nodes(node_ids, np.array([[0.0, 0, 0], [0, 3000, 0], [4000, 3000, 0]]))
+    model.add_frames(np.array([10, 11]), [0, 1], [1, 2], [0, 0], [0, 0])
+    model.restrain_many([node_ids[0]], gv.GLOBAL_DISP_DOFS)
+    case = LoadCase("P")
+    case.add_nodal_load(NodalLoad(model.node[3], gv.FY, -1e4))
+    model.load_combos["P"] = LoadCombination("P", {case: 1.0})
+    return model
+
+
+def test_numpy_ids_are_saved(tmp_path):
+    model = numpy_id_model()
+    assert all(type(node_id) is int for node_id in model.node)
+    assert all(type(element_id) is int for element_id in model.element)
+    model.save(tmp_path / "model.npz")
+    loaded = Model.load(tmp_path / "model.npz")
+    assert list(loaded.node) == [1, 2, 3] and list(loaded.element) == [10, 11]
+
+
+def test_result_store_matches_result_set(tmp_path):
+    model = numpy_id_model()
+    model.preprocess()
+    load_combos = list(model.load_combos.values())
+    expected = model.solve_all(load_combos)
+    model.solve_all(load_combos, store=tmp_path / "store").close()
+
+    store = ResultStore.open(tmp_path / "store")
+    assert_close(store.displacement(3, combo="P"), expected.displacement(3, combo="P"))
+    assert_close(store.end_force(11, combo="P"), expected.end_force(11, combo="P"))
+
+
+def test_load_without_preprocess(tmp_path):
+    model, load_combos = build_frame(seed=2)
+    model.preprocess()
+    model.save(tmp_path / "model.npz", load_combos)
+
+    assert Model.load(tmp_path / "model.npz")._preprocessed
+    loaded = Model.load(tmp_path / "model.npz", preprocess=False)
+    assert not loaded._preprocessed and loaded.K_ff_factor is None
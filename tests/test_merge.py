@@ -0,0 +1,56 @@
+# tests/test_merge.py
+
+from src.model.geometry.node import Node
+from src.model.elements.frame import Frame
+from src.model.materials.base_material import Material
+from src.model.sections.base_section import Section
+from src.model.model import Model
+from src.model.loads.load_case import LoadCase
+from src.model.loads.load_combo import LoadCombination
+from src.model.loads.nodal_load import NodalLoad
+from src.utils import global_variables as gv
+
+from tests.conftest import sequential_results, assert_close
+
+
+def portal(duplicate):
+    """
+    Fixed portal frame loaded at the top corners. duplicate=True defines
+    the right corner twice, the beam and the column end at different nodes.
+    """
+    mat = Material("S", E=200000, nu=0.3)
+    sec = Section("C", area=5000, Ixx=8e7, Iyy=3e7, J=1e6)
+    nodes = [Node(1, 0, 0), Node(2, 0, 3000), Node(3, 4000, 3000), Node(4, 4000, 0)]
+    corner = nodes[2]
+    if duplicate:
+        corner = Node(5, 4000, 3000 + 1e-9)
+        nodes.append(corner)
+    for node in (nodes[0], nodes[3]):
+        for dof in gv.GLOBAL_DISP_DOFS:
+            node.restrain(dof)
+    model = Model()
+    for node in nodes:
+        model.add_node(node)
+    model.add_element(Frame("C1", nodes[0], nodes[1], mat, sec))
+    model.add_element(Frame("B", nodes[1], nodes[2], mat, sec))
+    model.add_element(Frame("C2", nodes[3], corner, mat, sec))
+
+    # the load case is not registered in model.load_cases
+    wind = LoadCase("W")
+    wind.add_nodal_load(NodalLoad(nodes[1], gv.FX, 1e4))
+    wind.add_nodal_loads([corner], [[5e3, -2e4, 0.0, 0.0, 0.0, 0.0]])
+    return model, [LoadCombination("W", {wind: 1.0})]
+
+
+def test_merge_moves_loads_of_unregistered_cases():
+    model, load_combos = portal(duplicate=True)
+    assert model.merge_coincident_nodes(1e-6) == {5: 3}
+    model.preprocess()
+    (wind,) = load_combos[0].loadCaseAndFactors
+    assert [load.node.id for load in wind.nodalLoads] == [2, 3, 3]
+    actual = sequential_results(model, load_combos)
+
+    reference, reference_combos = portal(duplicate=False)
+    reference.preprocess()
+    for a, b in zip(actual, sequential_results(reference, reference_combos)):
+        assert_close(a, b)
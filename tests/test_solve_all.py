@@ -0,0 +1,66 @@
+# tests/test_solve_all.py
+
+import numpy as np
+import pytest
+
+from src.model.loads.load_combo import LoadCombination
+from src.model.loads.nodal_load import NodalLoad
+from tests.conftest import build_frame, sequential_results, assert_close
+
+
+@pytest.mark.parametrize("superposition", [False, True])
+def test_solve_all_matches_sequential_solves(frame, superposition):
+    model, load_combos = frame
+    model.preprocess()
+    results = model.solve_all(load_combos, superposition=superposition)
+    displacements, reactions, end_forces = sequential_results(model, load_combos)
+
+    assert results.combo_names == [combo.name for combo in load_combos]
+    assert_close(results.displacements, displacements)
+    assert_close(results.reactions, reactions)
+    assert_close(results.end_forces_local, end_forces)
+
+def test_solve_matches_dense_solve(frame):
+    model, load_combos = frame
+    model.preprocess()
+    model.linear_static_solve(load_combos[2])
+
+    free = model.free_dofs
+    D_f = np.linalg.solve(model.K_ff.toarray(), model.F_full[free])
+    assert_close(model.D_full[free], D_f)
+
+@pytest.mark.parametrize("solver, options", [
+    ("banded", {"reorder": "rcm"}),
+    ("cg", {"preconditioner": "block_jacobi", "tol": 1e-12}),
+])
+def test_solvers_match_sparse_lu(solver, options):
+    model, load_combos = build_frame()
+    model.preprocess()
+    expected = model.solve_all(load_combos).displacements
+
+    model.preprocess(solver=solver, **options)
+    assert_close(model.solve_all(load_combos).displacements, expected, rtol=1e-8)
+
+def test_superposition_cache_follows_load_case_changes(frame):
+    model, load_combos = frame
+    model.preprocess()
+    model.solve_all(load_combos, superposition=True)
+
+    load_case = next(iter(load_combos[1].loadCaseAndFactors))
+    node = next(node for node in model.node.values() if not node.restraints.get(0))
+    load_case.add_nodal_load(NodalLoad(node, 0, 5e4))
+
+    results = model.solve_all(load_combos, superposition=True)
+    displacements, _, _ = sequential_results(model, load_combos)
+    assert_close(results.displacements, displacements)
+
+def test_empty_combinations(frame):
+    model, _ = frame
+    model.preprocess()
+    for superposition in (False, True):
+        results = model.solve_all([], superposition=superposition)
+        assert results.displacements.shape == (0, len(model.node), 6)
+        assert results.end_forces_local.shape == (0, len(model.element), 2, 6)
+
+        results = model.solve_all([LoadCombination("none", {})], superposition=superposition)
+        assert not np.any(results.displacements)
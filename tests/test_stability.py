@@ -0,0 +1,65 @@
+# tests/test_stability.py
+
+import pytest
+
+from src.model.geometry.node import Node
+from src.model.elements.frame import Frame
+from src.model.materials.base_material import Material
+from src.model.sections.base_section import Section
+from src.model.model import Model
+from src.utils import global_variables as gv
+from src.utils.exceptions import StabilityError
+
+
+def sway_portal():
+    """Pinned portal frame with a beam released for bending at both ends."""
+    mat = Material("S", E=200000, nu=0.3)
+    sec = Section("T", area=5000, Ixx=5e7, Iyy=2e7, J=1e6)
+    a, b, c, d = Node(1, 0, 0), Node(2, 0, 3000), Node(3, 4000, 3000), Node(4, 4000, 0)
+    for node in (a, d):
+        for dof in (0, 1, 2, 3, 4):
+            node.restrain(dof)
+    model = Model()
+    for node in (a, b, c, d):
+        model.add_node(node)
+    model.add_element(Frame("C1", a, b, mat, sec))
+    model.add_element(Frame("B", b, c, mat, sec))
+    model.add_element(Frame("C2", d, c, mat, sec))
+    for dof in (4, 5):
+        model.element["B"].release("i", dof)
+        model.element["B"].release("j", dof)
+    return model
+
+
+def slender_chain(n):
+    """Cantilever of n rod-like frame members, stable but badly conditioned."""
+    mat = Material("S", E=200000, nu=0.3)
+    sec = Section("s", area=1e4, Ixx=1.0, Iyy=1.0, J=1.0)
+    nodes = [Node(k, 100.0*k, 0.0) for k in range(n + 1)]
+    for dof in gv.GLOBAL_DISP_DOFS:
+        nodes[0].restrain(dof)
+    model = Model()
+    for node in nodes:
+        model.add_node(node)
+    for k in range(n):
+        model.add_element(Frame(f"E{k}", nodes[k], nodes[k + 1], mat, sec))
+    return model
+
+
+@pytest.mark.parametrize("options", [
+    {}, {"solver": "banded"}, {"stability_check": "eigen"},
+    {"solver": "cg", "stability_check": "eigen"},
+])
+def test_mechanism_detected(options):
+    with pytest.raises(StabilityError, match="Node 2, DOF UX"):
+        sway_portal().preprocess(**options)
+
+
+def test_cg_pivots_only_warns(capsys):
+    sway_portal().preprocess(solver="cg")
+    assert "Warning: solver 'cg'" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("options", [{}, {"solver": "banded"}, {"stability_check": "eigen"}])
+def test_slender_chain_is_stable(options):
+    slender_chain(1000).preprocess(**options)
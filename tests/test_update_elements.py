@@ -0,0 +1,73 @@
+# tests/test_update_elements.py
+
+import numpy as np
+import pytest
+
+from src.model.sections.base_section import Section
+from src.model.elements.frame import Frame
+from src.model.analysis.solvers import LowRankUpdate
+
+from tests.conftest import build_frame, sequential_results, assert_close
+
+
+def change_sections(model):
+    stiff = Section("S", area=9000, Ixx=2e8, Iyy=9e7, J=3e6)
+    for element_id in ("C0", "C3"):
+        model.element[element_id].section = stiff
+    released = [
+        element for element in model.element.values()
+        if isinstance(element, Frame) and element.released_mask()
+    ]
+    released[0].section = stiff
+    return released[0].id
+
+
+@pytest.mark.parametrize("options", [
+    {}, {"solver": "banded", "reorder": "rcm"},
+    {"solver": "cg", "preconditioner": "block_jacobi", "tol": 1e-12},
+])
+def test_update_matches_full_preprocess(options):
+    model, load_combos = build_frame(seed=4)
+    model.preprocess(**options)
+    model.linear_static_solve(load_combos[0])
+    change_sections(model)
+    actual = sequential_results(model, load_combos)
+    if options.get("solver") != "cg":
+        assert isinstance(model.K_ff_factor, LowRankUpdate)
+
+    fresh, fresh_combos = build_frame(seed=4)
+    change_sections(fresh)
+    fresh.preprocess()
+    for a, b in zip(actual, sequential_results(fresh, fresh_combos)):
+        assert_close(a, b, rtol=1e-8)
+
+
+def test_update_refactorizes_beyond_max_rank():
+    model, load_combos = build_frame(seed=4)
+    model.preprocess()
+    change_sections(model)
+    model.update_elements(max_rank=1)
+    assert not isinstance(model.K_ff_factor, LowRankUpdate)
+
+    fresh, fresh_combos = build_frame(seed=4)
+    change_sections(fresh)
+    fresh.preprocess()
+    for a, b in zip(sequential_results(model, load_combos), sequential_results(fresh, fresh_combos)):
+        assert_close(a, b)
+
+
+def test_condensation_follows_element_changes():
+    model, _ = build_frame(seed=4)
+    model.preprocess()
+    element_id = change_sections(model)
+    element = model.element[element_id]
+    k_assembled, P_assembled = element.condensation()
+
+    element.section = Section("B2", area=3000, Ixx=6e7, Iyy=1e7, J=4e5)
+    k_changed, _ = element.condensation()
+    assert not np.allclose(k_changed, k_assembled)
+
+    element.j.y += 100.0
+    k_moved, P_moved = element.condensation()
+    assert not np.allclose(k_moved, k_changed)
+    assert not np.allclose(P_moved, P_assembled)